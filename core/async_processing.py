@@ -6,7 +6,7 @@ logger = logging.getLogger(__name__)
 
 async def async_analyze_multiple_stocks(tickers: List[str], trade_date: str, config: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Asynchronously analyze multiple stocks."""
-    from graphs.trading_graph import build_trading_graph
+    from graphs.trading_graph import build_trading_graph_async
     from core.evaluation import SignalProcessor
     from langchain_core.messages import HumanMessage
     from core.models import AgentState, InvestDebateState, RiskDebateState
@@ -28,8 +28,11 @@ async def async_analyze_multiple_stocks(tickers: List[str], trade_date: str, con
                 )
             )
             
-            graph = build_trading_graph(config)
-            final_state = graph.invoke(graph_input)
+            graph = await build_trading_graph_async()
+            final_state = await graph.ainvoke(
+                graph_input,
+                config={"configurable": {"thread_id": f"analysis_{ticker.upper()}_{trade_date}"}}
+            )
             
             signal_processor = SignalProcessor(ChatOpenAI(
                 model=config["quick_think_llm"],
@@ -1,6 +1,7 @@
 import redis
 import json
 import pickle
+from datetime import date, datetime, timedelta
 from typing import Any, Optional
 import logging
 
@@ -55,4 +56,27 @@ def cached_yfinance_data(func):
         result = func(*args, **kwargs)
         cache.set(cache_key, result, expire=86400)  # Cache for 24 hours
         return result
+    return wrapper
+
+def cached_technical_indicators(func):
+    """Decorator to cache technical indicator tables.
+    
+    Indicators over a range that ended before yesterday can no longer change,
+    so they are kept for 30 days; ranges reaching the latest session expire
+    after an hour so new bars are picked up.
+    """
+    def wrapper(symbol: str, start_date: str, end_date: str):
+        cache_key = f"indicators:{symbol}:{start_date}:{end_date}"
+        
+        cached_result = cache.get(cache_key)
+        if cached_result:
+            return cached_result
+        
+        result = func(symbol, start_date, end_date)
+        try:
+            settled = datetime.strptime(end_date, "%Y-%m-%d").date() < date.today() - timedelta(days=1)
+        except ValueError:
+            settled = False
+        cache.set(cache_key, result, expire=30 * 86400 if settled else 3600)
+        return result
     return wrapper
\ No newline at end of file
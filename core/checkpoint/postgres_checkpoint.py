@@ -1,21 +1,26 @@
 from langgraph.checkpoint.postgres import PostgresSaver
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from psycopg_pool import AsyncConnectionPool
 from sqlalchemy import create_engine
+import asyncio
 import os
 import logging
 
 logger = logging.getLogger(__name__)
 
-def create_postgres_checkpoint():
-    """Create a PostgreSQL checkpoint saver for LangGraph."""
-    # Database configuration from environment variables
+def _database_url() -> str:
+    """Build the checkpoint database URL from environment variables."""
     db_host = os.getenv("DB_HOST", "localhost")
     db_port = os.getenv("DB_PORT", "5432")
     db_name = os.getenv("DB_NAME", "financial_agents")
     db_username = os.getenv("DB_USERNAME", "postgres")
     db_password = os.getenv("DB_PASSWORD", "password")
     
-    # Create database URL
-    database_url = f"postgresql://{db_username}:{db_password}@{db_host}:{db_port}/{db_name}"
+    return f"postgresql://{db_username}:{db_password}@{db_host}:{db_port}/{db_name}"
+
+def create_postgres_checkpoint():
+    """Create a PostgreSQL checkpoint saver for LangGraph."""
+    database_url = _database_url()
     
     try:
         # Create SQLAlchemy engine
@@ -42,4 +47,44 @@ def get_postgres_checkpoint():
     global postgres_checkpoint
     if postgres_checkpoint is None:
         postgres_checkpoint = create_postgres_checkpoint()
-    return postgres_checkpoint
\ No newline at end of file
+    return postgres_checkpoint
+
+async def create_async_postgres_checkpoint(pool_size: int = 16):
+    """Create an async PostgreSQL checkpoint saver backed by a connection pool.
+
+    Checkpoint writes happen at every super-step; the async saver keeps them
+    off the event loop when the graph is driven with ``ainvoke``.
+    """
+    try:
+        pool = AsyncConnectionPool(
+            conninfo=_database_url(),
+            max_size=pool_size,
+            open=False,
+            kwargs={"autocommit": True, "prepare_threshold": 0},
+        )
+        await pool.open()
+        
+        checkpointer = AsyncPostgresSaver(pool)
+        await checkpointer.setup()
+        
+        logger.info("Async PostgreSQL checkpoint saver created successfully")
+        return checkpointer
+        
+    except Exception as e:
+        logger.error(f"Failed to create async PostgreSQL checkpoint: {e}")
+        raise
+
+# Global async checkpoint instance
+async_postgres_checkpoint = None
+# Concurrent first callers (one graph per ticker under asyncio.gather) would
+# otherwise each open their own pool while the first one is still being set up
+_async_checkpoint_lock = asyncio.Lock()
+
+async def get_async_postgres_checkpoint():
+    """Get or create the async PostgreSQL checkpoint instance."""
+    global async_postgres_checkpoint
+    if async_postgres_checkpoint is None:
+        async with _async_checkpoint_lock:
+            if async_postgres_checkpoint is None:
+                async_postgres_checkpoint = await create_async_postgres_checkpoint()
+    return async_postgres_checkpoint
@@ -22,6 +22,9 @@ engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,
     pool_recycle=300,
+    pool_size=16,
+    max_overflow=32,
+    insertmanyvalues_page_size=10_000,  # batch multi-row INSERTs into few round trips
     echo=False  # Set to True for debugging
 )
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Text, ForeignKey, JSON, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, ForeignKey, JSON, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from core.db.connection import Base
@@ -77,6 +77,11 @@ class Position(Base):
     # Relationship
     portfolio = relationship("Portfolio", back_populates="positions")
 
+    # One row per symbol per portfolio; serves the per-symbol position lookup
+    __table_args__ = (
+        Index("ix_pos_port_sym", "portfolio_id", "ticker", unique=True),
+    )
+
     def __repr__(self):
         return f"<Position(ticker='{self.ticker}', quantity={self.quantity}, average_cost={self.average_cost})>"
 
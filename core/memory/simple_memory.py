@@ -1,17 +1,62 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+from collections import OrderedDict
 from sqlalchemy.orm import Session
 from core.db.connection import get_db
 from core.db.models import AgentMemory
+import threading
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Read-through cache shared by every SimpleMemory with the same agent name,
+# keyed by (agent_name, query kind, limit) and holding (expiry, memories).
+# Writes in this process drop that agent's entries and bump its generation,
+# so a read that started before the write cannot store its stale result;
+# the short TTL bounds how long writes from other processes go unseen.
+_CACHE_MAXSIZE = 256
+_CACHE_TTL = 30.0
+_cache: "OrderedDict[Tuple[str, str, int], Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+_generations: Dict[str, int] = {}
+_cache_lock = threading.Lock()
+
 class SimpleMemory:
     """Simple persistent memory store using PostgreSQL (no vectors)."""
     
     def __init__(self, agent_name: str):
         self.agent_name = agent_name
     
+    def _cache_get(self, kind: str, limit: int) -> Tuple[Optional[List[Dict[str, Any]]], int]:
+        """Cached memories (copies) or None, and the generation to pass to ``_cache_put``."""
+        key = (self.agent_name, kind, limit)
+        with _cache_lock:
+            generation = _generations.get(self.agent_name, 0)
+            hit = _cache.get(key)
+            if hit is not None:
+                if hit[0] > time.monotonic():
+                    _cache.move_to_end(key)
+                    return [dict(m) for m in hit[1]], generation
+                del _cache[key]
+        return None, generation
+    
+    def _cache_put(self, kind: str, limit: int, memories: List[Dict[str, Any]], generation: int) -> None:
+        with _cache_lock:
+            # A write since the read started means the result may already be stale
+            if _generations.get(self.agent_name, 0) != generation:
+                return
+            _cache[(self.agent_name, kind, limit)] = (
+                time.monotonic() + _CACHE_TTL, [dict(m) for m in memories]
+            )
+            if len(_cache) > _CACHE_MAXSIZE:
+                _cache.popitem(last=False)
+    
+    def invalidate_cache(self) -> None:
+        """Drop cached reads for this agent (called on every write)."""
+        with _cache_lock:
+            _generations[self.agent_name] = _generations.get(self.agent_name, 0) + 1
+            for key in [k for k in _cache if k[0] == self.agent_name]:
+                del _cache[key]
+    
     def add_memory(self, situation: str, recommendation: str) -> bool:
         """Add a new memory to the persistent store."""
         try:
@@ -23,6 +68,7 @@ class SimpleMemory:
             )
             db.add(memory)
             db.commit()
+            self.invalidate_cache()
             
             logger.info(f"Memory added successfully for agent {self.agent_name}")
             return True
@@ -32,13 +78,16 @@ class SimpleMemory:
     
     def get_recent_memories(self, limit: int = 5) -> List[Dict[str, Any]]:
         """Get recent memories for this agent."""
+        cached, generation = self._cache_get("recent", limit)
+        if cached is not None:
+            return cached
         try:
             db = next(get_db())
             memories = db.query(AgentMemory).filter(
                 AgentMemory.agent_name == self.agent_name
             ).order_by(AgentMemory.created_at.desc()).limit(limit).all()
             
-            return [
+            result = [
                 {
                     "situation": memory.situation,
                     "recommendation": memory.recommendation,
@@ -46,19 +95,24 @@ class SimpleMemory:
                 }
                 for memory in memories
             ]
+            self._cache_put("recent", limit, result, generation)
+            return result
         except Exception as e:
             logger.error(f"Error retrieving memories: {e}")
             return []
     
     def get_all_memories(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get all memories for this agent."""
+        cached, generation = self._cache_get("all", limit)
+        if cached is not None:
+            return cached
         try:
             db = next(get_db())
             memories = db.query(AgentMemory).filter(
                 AgentMemory.agent_name == self.agent_name
             ).order_by(AgentMemory.created_at.desc()).limit(limit).all()
             
-            return [
+            result = [
                 {
                     "situation": memory.situation,
                     "recommendation": memory.recommendation,
@@ -66,6 +120,8 @@ class SimpleMemory:
                 }
                 for memory in memories
             ]
+            self._cache_put("all", limit, result, generation)
+            return result
         except Exception as e:
             logger.error(f"Error retrieving memories: {e}")
             return []
@@ -76,6 +132,7 @@ class SimpleMemory:
             db = next(get_db())
             db.query(AgentMemory).filter(AgentMemory.agent_name == self.agent_name).delete()
             db.commit()
+            self.invalidate_cache()
             
             logger.info(f"Cleared all memories for agent {self.agent_name}")
             return True
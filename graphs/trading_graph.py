@@ -15,7 +15,7 @@ from tools.toolkit import Toolkit
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import MessagesPlaceholder
 from langchain_openai import ChatOpenAI
-from core.checkpoint.postgres_checkpoint import get_postgres_checkpoint
+from core.checkpoint.postgres_checkpoint import get_postgres_checkpoint, get_async_postgres_checkpoint
 from config import settings  # Use centralized config
 import logging
 
@@ -38,8 +38,12 @@ def create_analyst_node(llm, toolkit, system_message, tools, output_field):
 
     def analyst_node(state):
         try:
-            prompt_with_data = prompt.partial(current_date=state["trade_date"], ticker=state["company_of_interest"])
-            result = prompt_with_data.invoke(state["messages"])
+            # Static fields are bound above; per-run fields go straight to invoke
+            result = chain.invoke({
+                "messages": state["messages"],
+                "current_date": state["trade_date"],
+                "ticker": state["company_of_interest"],
+            })
             report = ""
             if not result.tool_calls:
                 report = result.content
@@ -64,7 +68,7 @@ def create_research_manager(llm, memory):
             return {"investment_plan": f"Error generating investment plan: {e}"}
     return research_manager_node
 
-def build_trading_graph():
+def _build_workflow():
     try:
         # Use centralized settings instead of config parameter
         config = settings
@@ -177,11 +181,19 @@ def build_trading_graph():
         workflow.add_edge("tools", "News Analyst")
         workflow.add_edge("tools", "Fundamentals Analyst")
         
-        # Compile with checkpointing
-        checkpointer = get_postgres_checkpoint()
-        compiled_graph = workflow.compile(checkpointer=checkpointer)
-        
-        return compiled_graph
+        return workflow
     except Exception as e:
         logger.error(f"Error building trading graph: {e}")
-        raise
\ No newline at end of file
+        raise
+
+def build_trading_graph():
+    # Compile with checkpointing
+    checkpointer = get_postgres_checkpoint()
+    compiled_graph = _build_workflow().compile(checkpointer=checkpointer)
+    
+    return compiled_graph
+
+async def build_trading_graph_async():
+    """Compile the graph against the pooled async checkpointer; run it with ainvoke."""
+    checkpointer = await get_async_postgres_checkpoint()
+    return _build_workflow().compile(checkpointer=checkpointer)
\ No newline at end of file
@@ -0,0 +1,102 @@
+"""Numba kernels behind the risk and sizing helpers.
+
+Free functions over float64 price arrays so the public wrappers only pay for
+one ``to_numpy`` conversion. Returns are computed on the fly; NaN returns are
+skipped, matching ``pct_change().dropna()``. Explicit signatures make Numba
+compile (or load from its on-disk cache) at import rather than on the first
+call inside an agent step; fastmath stays off because the kernels rely on NaN
+checks. Without numba installed the kernels run as plain Python.
+"""
+
+import math
+
+import numpy as np
+
+from utils._njit import njit
+
+# pandas hands out read-only views (copy-on-write), so each kernel is compiled
+# for writable and read-only, contiguous and strided float64 arrays
+_ARRAY_TYPES = (
+    "float64[::1]",
+    "float64[:]",
+    "Array(float64, 1, 'C', readonly=True)",
+    "Array(float64, 1, 'A', readonly=True)",
+)
+
+
+def _sigs(template):
+    return [template.format(array_type) for array_type in _ARRAY_TYPES]
+
+
+@njit(_sigs("float64({}, float64)"), cache=True)
+def _var_nb(prices, confidence):
+    n = prices.size
+    returns = np.empty(max(n - 1, 0), dtype=np.float64)
+    m = 0
+    for i in range(1, n):
+        r = prices[i] / prices[i - 1] - 1.0
+        if not np.isnan(r):
+            returns[m] = r
+            m += 1
+    if m == 0:
+        return 0.0
+    k = int((1.0 - confidence) * m)
+    if k < 0:
+        k = 0
+    elif k >= m:
+        k = m - 1
+    return -np.partition(returns[:m], k)[k]
+
+
+@njit(_sigs("float64({}, int64)"), cache=True)
+def _vol_nb(prices, window):
+    # Welford over the last `window` valid returns, walking backwards from the end
+    mean = 0.0
+    m2 = 0.0
+    count = 0
+    i = prices.size - 1
+    while i >= 1 and count < window:
+        r = prices[i] / prices[i - 1] - 1.0
+        i -= 1
+        if np.isnan(r):
+            continue
+        count += 1
+        delta = r - mean
+        mean += delta / count
+        m2 += delta * (r - mean)
+    if count < 2:
+        return 0.0
+    return math.sqrt(m2 / (count - 1)) * math.sqrt(252.0)
+
+
+@njit(_sigs("float64({})"), cache=True)
+def _max_drawdown_nb(returns):
+    # cumprod, running peak and drawdown fused into one pass; NaN returns count as 0
+    cum = 1.0
+    peak = -np.inf
+    mdd = 0.0
+    for i in range(returns.size):
+        r = returns[i]
+        if not np.isnan(r):
+            cum *= 1.0 + r
+        if cum > peak:
+            peak = cum
+        dd = cum / peak - 1.0
+        if dd < mdd:
+            mdd = dd
+    return mdd
+
+
+def _window_prices(price_series, window):
+    """Float64 prices ``_vol_nb`` needs for the last ``window`` returns.
+
+    Only the trailing ``window + 1`` prices are converted; the whole series is
+    only used when that tail has gaps and older returns have to fill in.
+    """
+    # na_value keeps nullable Float64 / object series (pd.NA, None) convertible
+    tail = price_series.iloc[-(max(window, 0) + 1) :].to_numpy(
+        dtype=np.float64, na_value=np.nan
+    )
+    if np.isnan(tail).any():
+        return price_series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return tail
@@ -4,10 +4,109 @@ from __future__ import annotations
 Provides a minimal framework to evaluate a list of executed orders against
 historical price series and compute basic performance metrics.
 """
-from dataclasses import dataclass
-from typing import List, Dict, Any, Mapping, Optional
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Mapping, Optional, Sequence, Tuple, Union
+import hashlib
+import numpy as np
 import pandas as pd
 import math
+from joblib import Parallel, delayed
+
+
+class TradeLog:
+    """Columnar (struct-of-arrays) store for backtest fills.
+
+    Each fill is written into parallel NumPy arrays through an integer cursor,
+    so cost reductions run over contiguous float64 buffers. Per-trade dicts
+    are only built when ``to_records`` is called.
+    """
+
+    _INT_COLUMNS = ('bar', 'qty', 'remaining', 'original_qty', 'position_after')
+    _FLOAT_COLUMNS = ('price', 'effective_price', 'commission', 'impact_applied', 'cash_after')
+
+    def __init__(self, dates: Sequence[Any], slippage_bps: int,
+                 symbols: Optional[Sequence[str]] = None, capacity: int = 64):
+        self.dates = dates
+        self.symbols = symbols
+        self.slippage_bps = slippage_bps
+        self.n = 0
+        capacity = max(1, capacity)
+        self.side = np.empty(capacity, dtype=np.int8)  # +1 BUY, -1 SELL
+        self.symbol = np.empty(capacity, dtype=np.int32)
+        for name in self._INT_COLUMNS:
+            setattr(self, name, np.empty(capacity, dtype=np.int64))
+        for name in self._FLOAT_COLUMNS:
+            setattr(self, name, np.empty(capacity, dtype=np.float64))
+
+    def __len__(self) -> int:
+        return self.n
+
+    def _grow(self) -> None:
+        for name in ('side', 'symbol') + self._INT_COLUMNS + self._FLOAT_COLUMNS:
+            old = getattr(self, name)
+            new = np.empty(old.size * 2, dtype=old.dtype)
+            new[:old.size] = old
+            setattr(self, name, new)
+
+    def append(self, bar: int, side: int, qty: int, price: float, effective_price: float,
+               commission: float, remaining: int, original_qty: int, impact: float,
+               position_after: int, cash_after: float, symbol: int = 0) -> None:
+        i = self.n
+        if i == self.side.size:
+            self._grow()
+        self.bar[i] = bar
+        self.side[i] = side
+        self.symbol[i] = symbol
+        self.qty[i] = qty
+        self.price[i] = price
+        self.effective_price[i] = effective_price
+        self.commission[i] = commission
+        self.remaining[i] = remaining
+        self.original_qty[i] = original_qty
+        self.impact_applied[i] = impact
+        self.position_after[i] = position_after
+        self.cash_after[i] = cash_after
+        self.n = i + 1
+
+    def total_commission(self) -> float:
+        return float(self.commission[:self.n].sum())
+
+    def total_slip_cost(self) -> float:
+        """Cost versus close: (effective - close) * qty for buys, mirrored for sells."""
+        n = self.n
+        slip = (self.effective_price[:n] - self.price[:n]) * self.side[:n]
+        return float((slip * self.qty[:n]).sum())
+
+    def total_notional(self) -> float:
+        n = self.n
+        return float((self.effective_price[:n] * self.qty[:n]).sum())
+
+    def closed_sells(self) -> int:
+        n = self.n
+        return int(np.count_nonzero((self.side[:n] == -1) & (self.remaining[:n] == 0)))
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        records: List[Dict[str, Any]] = []
+        for i in range(self.n):
+            record: Dict[str, Any] = {'date': self.dates[int(self.bar[i])]}
+            if self.symbols is not None:
+                record['symbol'] = self.symbols[int(self.symbol[i])]
+            record.update({
+                'side': 'BUY' if self.side[i] == 1 else 'SELL',
+                'qty': int(self.qty[i]),
+                'price': float(self.price[i]),
+                'effective_price': float(self.effective_price[i]),
+                'commission': float(self.commission[i]),
+                'slippage_bps': self.slippage_bps,
+                'remaining': int(self.remaining[i]),
+                'original_qty': int(self.original_qty[i]),
+                'impact_applied': float(self.impact_applied[i]),
+                'position_after': int(self.position_after[i]),
+                'cash_after': float(self.cash_after[i]),
+            })
+            records.append(record)
+        return records
 
 
 @dataclass
@@ -18,6 +117,13 @@ class BacktestResult:
     total_trades: int
     win_rate: float
     final_portfolio_value: float
+    trade_log: Optional[TradeLog] = field(default=None, repr=False, compare=False)
+    equity_curve: Optional[pd.Series] = field(default=None, repr=False, compare=False)
+
+    @property
+    def trades(self) -> List[Dict[str, Any]]:
+        """Per-fill dicts, materialized from the columnar trade log on access."""
+        return self.trade_log.to_records() if self.trade_log is not None else []
 
 
 class BacktestService:
@@ -67,138 +173,16 @@ class BacktestService:
                 impact_model: str = 'linear',
                 impact_power: float = 0.5) -> BacktestResult:
         """Backtest a list of orders against historical price data."""
-        if price_df.empty or 'Close' not in price_df.columns:
-            raise ValueError("price_df must contain Close column")
-        # Normalize index to datetime
-        price_df = price_df.copy()
-        if not isinstance(price_df.index, pd.DatetimeIndex):
-            if 'Date' in price_df.columns:
-                price_df = price_df.set_index(pd.to_datetime(price_df['Date']))
-            else:
-                raise ValueError("price_df must have a DatetimeIndex or a 'Date' column")
-
-        position = 0
-        cash = 100000.0
-        trades: List[Dict[str, Any]] = []
-        equity_values = []
-        slip = slippage_bps / 10000.0
-        gross_exposure_peak = 0.0
-        cumulative_participation = 0.0  # fraction of cumulative volume we've represented
-        cum_volume = 0.0
-        for date, row in price_df.iterrows():
-            bar_volume = float(row.get('Volume', 1.0)) if participation_cap else None
-            # Execute any orders for this date (toy: all at same symbol)
-            todays_orders: List[Dict[str, Any]] = []
-            for o in orders:
-                ts_val = o.get('timestamp')
-                if ts_val is None:
-                    continue
-                try:
-                    o_dt = pd.to_datetime(ts_val)
-                except Exception:  # noqa: BLE001
-                    continue
-                if o_dt <= date:
-                    todays_orders.append(o)
-            for o in todays_orders:
-                if o.get('_executed'):
-                    continue
-                side = o['side']
-                original_qty = int(o['qty'])
-                remaining = int(o.get('_remaining', original_qty))
-                # Partial fill sizing
-                if participation_cap and bar_volume and bar_volume > 0:
-                    max_bar_qty = max(1, int(bar_volume * participation_cap))
-                    fill_qty = min(remaining, max_bar_qty)
-                else:
-                    fill_qty = remaining
-                price = float(row['Close'])
-                # Include base spread if partial fill mode enabled
-                spread_adj = 0.0
-                if participation_cap:
-                    spread_adj = (base_spread_bps / 10000.0) * price * (1 if side == 'BUY' else -1)
-                effective_price = price + spread_adj
-                effective_price = effective_price * (1 + slip) if side == 'BUY' else effective_price * (1 - slip)
-                # Track cumulative volume (if volume present)
-                if bar_volume and bar_volume > 0:
-                    cum_volume += bar_volume
-                impact = 0.0
-                prev_abs_qty = 0.0
-                if impact_coef > 0 and cum_volume > 0:
-                    prev_abs_qty = cumulative_participation * cum_volume
-                    prospective_participation = (prev_abs_qty + fill_qty) / cum_volume
-                    if impact_model == 'sqrt':
-                        scale = prospective_participation ** 0.5
-                    elif impact_model == 'power':
-                        scale = prospective_participation ** max(1e-6, impact_power)
-                    else:  # linear
-                        scale = prospective_participation
-                    impact = impact_coef * scale * price
-                    effective_price = effective_price + (impact if side == 'BUY' else -impact)
-                notional = fill_qty * effective_price
-                commission = notional * commission_pct
-                if side == 'BUY':
-                    cash -= notional + commission
-                    position += fill_qty
-                else:  # SELL
-                    cash += notional - commission
-                    position -= fill_qty
-                remaining_after = remaining - fill_qty
-                if remaining_after > 0:
-                    o['_remaining'] = remaining_after
-                else:
-                    o['_executed'] = True
-                trades.append({
-                    'date': date,
-                    'side': side,
-                    'qty': fill_qty,
-                    'price': price,
-                    'effective_price': effective_price,
-                    'commission': commission,
-                    'slippage_bps': slippage_bps,
-                    'remaining': max(0, remaining_after),
-                    'original_qty': original_qty,
-                    'impact_applied': impact,
-                    'position_after': position,
-                    'cash_after': cash,
-                })
-                # Update cumulative participation after applying fill
-                if bar_volume and bar_volume > 0 and cum_volume > 0:
-                    cumulative_participation = min(1.0, (prev_abs_qty + fill_qty) / cum_volume)
-            # Mark-to-market
-            mtm = position * float(row['Close'])
-            equity = cash + mtm
-            equity_values.append((date, equity))
-            gross_exposure_peak = max(gross_exposure_peak, abs(position) * float(row['Close']))
-
-        equity_series = pd.Series([v for _, v in equity_values], index=[d for d, _ in equity_values])
-        returns = equity_series.pct_change().dropna()
-        sharpe = _compute_sharpe(returns)
-        max_dd = _compute_max_drawdown(equity_series)
-        total_commission = sum(t.get('commission', 0.0) for t in trades)
-        # Slippage cost per trade approximated as difference between effective and mid (here close) * qty
-        total_slip_cost = 0.0
-        for t in trades:
-            px = t.get('price')
-            epx = t.get('effective_price')
-            qty = t.get('qty', 0)
-            if px is not None and epx is not None:
-                # For buys effective > price (cost), for sells effective < price (cost as price-epx)
-                if t.get('side') == 'BUY':
-                    total_slip_cost += (epx - px) * qty
-                else:
-                    total_slip_cost += (px - epx) * qty
-        total_notional = sum((t.get('effective_price', 0.0) or 0.0) * t.get('qty', 0) for t in trades)
-        total_trades = len(trades)
-        avg_cost_bps = 0.0
-        if total_notional > 0:
-            avg_cost_bps = ((total_commission + total_slip_cost) / total_notional) * 10000.0
-        return BacktestResult(
-            total_return=returns.sum(),
-            sharpe_ratio=sharpe,
-            max_drawdown=max_dd,
-            total_trades=total_trades,
-            win_rate=len([t for t in trades if t['side'] == 'SELL' and t.get('remaining', 0) == 0]) / total_trades if total_trades > 0 else 0.0,
-            final_portfolio_value=equity_series.iloc[-1] if not equity_series.empty else 0.0,
+        return backtest(
+            price_df,
+            orders,
+            commission_pct=commission_pct,
+            slippage_bps=slippage_bps,
+            participation_cap=participation_cap,
+            base_spread_bps=base_spread_bps,
+            impact_coef=impact_coef,
+            impact_model=impact_model,
+            impact_power=impact_power,
         )
 
 
@@ -221,9 +205,161 @@ def _compute_max_drawdown(equity: pd.Series) -> float:
     return float(dd.min())
 
 
+@dataclass(frozen=True, slots=True)
+class PriceSeries:
+    """Struct-of-arrays view of one symbol's bars.
+
+    Built once from a price frame so the simulation loops index contiguous
+    float64 arrays with an integer cursor instead of going through pandas.
+    """
+    index: pd.DatetimeIndex
+    ts: np.ndarray  # tz-naive datetime64[ns] per bar, comparable with order timestamps
+    close: np.ndarray  # float64
+    volume: Optional[np.ndarray] = None  # float64, None when the frame has no Volume column
+
+    def __len__(self) -> int:
+        return self.close.size
+
+    @classmethod
+    def from_df(cls, df: pd.DataFrame) -> "PriceSeries":
+        if df.empty or 'Close' not in df.columns:
+            raise ValueError("price_df must contain Close column")
+        # Normalize index to datetime
+        if isinstance(df.index, pd.DatetimeIndex):
+            index = df.index
+        elif 'Date' in df.columns:
+            index = pd.DatetimeIndex(pd.to_datetime(df['Date']))
+        else:
+            raise ValueError("price_df must have a DatetimeIndex or a 'Date' column")
+        ts = (index.tz_convert(None) if index.tz is not None else index).values.astype('datetime64[ns]')
+        volume = df['Volume'].to_numpy(np.float64) if 'Volume' in df.columns else None
+        return cls(index, ts, df['Close'].to_numpy(np.float64), volume)
+
+
+@dataclass(frozen=True)
+class PreparedBacktest:
+    """Parameter-independent setup for ``backtest``.
+
+    Holds the price arrays and order timestamps parsed once, so
+    cost-parameter sweeps over the same data skip re-parsing on every call.
+    """
+    prices: PriceSeries
+    order_ts: np.ndarray  # datetime64[ns] per order, NaT when missing/unparseable
+    order_side: np.ndarray  # int8 per order: +1 BUY, -1 SELL
+    order_qty: np.ndarray  # int64 per order
+
+
+_PREPARE_CACHE_SIZE = 32
+_prepare_cache: "OrderedDict[Tuple[bytes, Tuple[Any, ...]], PreparedBacktest]" = OrderedDict()
+
+
+def _to_naive_datetime64(ts: pd.Timestamp) -> np.datetime64:
+    if ts is pd.NaT:
+        return np.datetime64('NaT', 'ns')
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert(None)
+    return ts.to_datetime64()
+
+
+def _order_arrays(orders: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Parse orders once into (timestamp, side sign, qty) arrays.
+
+    Orders without a usable timestamp never execute, so their side and qty
+    are not read.
+    """
+    n = len(orders)
+    order_ts = np.full(n, np.datetime64('NaT', 'ns'), dtype='datetime64[ns]')
+    order_side = np.zeros(n, dtype=np.int8)
+    order_qty = np.zeros(n, dtype=np.int64)
+    for i, o in enumerate(orders):
+        ts_val = o.get('timestamp')
+        if ts_val is None:
+            continue
+        try:
+            ts = _to_naive_datetime64(pd.to_datetime(ts_val))
+        except Exception:  # noqa: BLE001
+            continue
+        order_ts[i] = ts
+        if not np.isnat(ts):
+            order_side[i] = 1 if o['side'] == 'BUY' else -1
+            order_qty[i] = int(o['qty'])
+    return order_ts, order_side, order_qty
+
+
+def precompile(price_df: Union[pd.DataFrame, PriceSeries], orders: List[Dict[str, Any]]) -> PreparedBacktest:
+    """Validate and normalize inputs for ``backtest`` once.
+
+    Pass the result as ``price_df`` to ``backtest`` to reuse it across calls.
+    """
+    prices = price_df if isinstance(price_df, PriceSeries) else PriceSeries.from_df(price_df)
+    return PreparedBacktest(prices, *_order_arrays(orders))
+
+
+def _prepare(price_df: Union[pd.DataFrame, PriceSeries], orders: List[Dict[str, Any]]) -> PreparedBacktest:
+    """``precompile`` memoized on the price and order contents.
+
+    Prices are matched by a digest of the raw bar arrays, taken before any
+    conversion, so a frame edited in place misses the cache. The digest is
+    still one pass over the prices; a hit saves the conversion and the order
+    parsing. Cached entries hold copies of the arrays and keep no reference
+    to the caller's frame.
+    """
+    digest = _price_digest(price_df)
+    if digest is None:
+        return precompile(price_df, orders)
+    try:
+        key = (digest, tuple((o.get('timestamp'), o.get('side'), o.get('qty')) for o in orders))
+        hash(key)
+    except TypeError:
+        return precompile(price_df, orders)
+    hit = _prepare_cache.get(key)
+    if hit is not None:
+        _prepare_cache.move_to_end(key)
+        return hit
+    prices = price_df if isinstance(price_df, PriceSeries) else PriceSeries.from_df(price_df)
+    prices = PriceSeries(
+        prices.index,
+        prices.ts.copy(),
+        prices.close.copy(),
+        None if prices.volume is None else prices.volume.copy(),
+    )
+    prepared = precompile(prices, orders)
+    _prepare_cache[key] = prepared
+    if len(_prepare_cache) > _PREPARE_CACHE_SIZE:
+        _prepare_cache.popitem(last=False)
+    return prepared
+
+
+def _price_digest(price_df: Union[pd.DataFrame, PriceSeries]) -> Optional[bytes]:
+    """Digest of the bar timestamps, closes and volumes, or None if they cannot be hashed cheaply."""
+    if isinstance(price_df, PriceSeries):
+        arrays = [price_df.ts, price_df.close, price_df.volume]
+    else:
+        if 'Close' not in price_df.columns:
+            return None
+        if isinstance(price_df.index, pd.DatetimeIndex):
+            dates = price_df.index.asi8
+        elif 'Date' in price_df.columns:
+            dates = price_df['Date'].to_numpy()
+        else:
+            return None
+        volume = price_df['Volume'].to_numpy() if 'Volume' in price_df.columns else None
+        arrays = [dates, price_df['Close'].to_numpy(), volume]
+    h = hashlib.blake2b(digest_size=16)
+    for arr in arrays:
+        if arr is None:
+            h.update(b'-')
+            continue
+        if arr.dtype.hasobject:
+            return None
+        h.update(arr.dtype.str.encode())
+        h.update(np.ascontiguousarray(arr).view(np.uint8))
+    return h.digest()
+
+
 def backtest(
-    price_df: pd.DataFrame,
-    orders: List[Dict[str, Any]],
+    price_df: Union[pd.DataFrame, PriceSeries, PreparedBacktest],
+    orders: Optional[List[Dict[str, Any]]] = None,
     commission_pct: float = 0.0005,
     slippage_bps: int = 5,
     participation_cap: Optional[float] = None,  # max fraction of synthetic bar volume
@@ -238,58 +374,58 @@ def backtest(
     - All orders executed at close price of the day they appear (with slippage adjustment).
     - Single symbol per provided DataFrame; 'Close' column required.
     - Commission (percentage of notional) and slippage (bps) applied if non-zero.
+
+    price_df may be a ``PriceSeries`` built once with ``PriceSeries.from_df``, or the
+    result of ``precompile(price_df, orders)``, in which case ``orders`` can be
+    omitted; use this to hoist setup out of parameter sweeps.
     """
-    if price_df.empty or 'Close' not in price_df.columns:
-        raise ValueError("price_df must contain Close column")
-    # Normalize index to datetime
-    price_df = price_df.copy()
-    if not isinstance(price_df.index, pd.DatetimeIndex):
-        if 'Date' in price_df.columns:
-            price_df = price_df.set_index(pd.to_datetime(price_df['Date']))
-        else:
-            raise ValueError("price_df must have a DatetimeIndex or a 'Date' column")
+    if isinstance(price_df, PreparedBacktest):
+        prepared = price_df
+    else:
+        if orders is None:
+            raise ValueError("orders are required unless a PreparedBacktest is given")
+        prepared = _prepare(price_df, orders)
+    prices = prepared.prices
+    order_ts = prepared.order_ts
+    order_side = prepared.order_side
+    bar_ts = prepared.prices.ts
+    close = prices.close
+    volume = prices.volume
+    # Per-order fill state lives here, so caller's orders stay untouched and reusable
+    executed = np.zeros(order_ts.size, dtype=bool)
+    remaining_qty = prepared.order_qty.copy()
 
     position = 0
     cash = 100000.0
-    trades: List[Dict[str, Any]] = []
-    equity_values = []
+    trades = TradeLog(prices.index, slippage_bps)
+    equity_values = np.empty(len(prices), dtype=np.float64)
     slip = slippage_bps / 10000.0
     gross_exposure_peak = 0.0
     cumulative_participation = 0.0  # fraction of cumulative volume we've represented
     cum_volume = 0.0
-    for date, row in price_df.iterrows():
-        bar_volume = float(row.get('Volume', 1.0)) if participation_cap else None
+    for bar in range(len(prices)):
+        price = float(close[bar])
+        if participation_cap:
+            bar_volume = float(volume[bar]) if volume is not None else 1.0
+        else:
+            bar_volume = None
         # Execute any orders for this date (toy: all at same symbol)
-        todays_orders: List[Dict[str, Any]] = []
-        for o in orders:
-            ts_val = o.get('timestamp')
-            if ts_val is None:
-                continue
-            try:
-                o_dt = pd.to_datetime(ts_val)
-            except Exception:  # noqa: BLE001
-                continue
-            if o_dt <= date:
-                todays_orders.append(o)
-        for o in todays_orders:
-            if o.get('_executed'):
-                continue
-            side = o['side']
-            original_qty = int(o['qty'])
-            remaining = int(o.get('_remaining', original_qty))
+        for i in np.flatnonzero((order_ts <= bar_ts[bar]) & ~executed):
+            is_buy = order_side[i] == 1
+            original_qty = int(prepared.order_qty[i])
+            remaining = int(remaining_qty[i])
             # Partial fill sizing
             if participation_cap and bar_volume and bar_volume > 0:
                 max_bar_qty = max(1, int(bar_volume * participation_cap))
                 fill_qty = min(remaining, max_bar_qty)
             else:
                 fill_qty = remaining
-            price = float(row['Close'])
             # Include base spread if partial fill mode enabled
             spread_adj = 0.0
             if participation_cap:
-                spread_adj = (base_spread_bps / 10000.0) * price * (1 if side == 'BUY' else -1)
+                spread_adj = (base_spread_bps / 10000.0) * price * (1 if is_buy else -1)
             effective_price = price + spread_adj
-            effective_price = effective_price * (1 + slip) if side == 'BUY' else effective_price * (1 - slip)
+            effective_price = effective_price * (1 + slip) if is_buy else effective_price * (1 - slip)
             # Track cumulative volume (if volume present)
             if bar_volume and bar_volume > 0:
                 cum_volume += bar_volume
@@ -305,77 +441,34 @@ def backtest(
                 else:  # linear
                     scale = prospective_participation
                 impact = impact_coef * scale * price
-                effective_price = effective_price + (impact if side == 'BUY' else -impact)
+                effective_price = effective_price + (impact if is_buy else -impact)
             notional = fill_qty * effective_price
             commission = notional * commission_pct
-            if side == 'BUY':
+            if is_buy:
                 cash -= notional + commission
                 position += fill_qty
             else:  # SELL
                 cash += notional - commission
                 position -= fill_qty
             remaining_after = remaining - fill_qty
-            if remaining_after > 0:
-                o['_remaining'] = remaining_after
-            else:
-                o['_executed'] = True
-            trades.append({
-                'date': date,
-                'side': side,
-                'qty': fill_qty,
-                'price': price,
-                'effective_price': effective_price,
-                'commission': commission,
-                'slippage_bps': slippage_bps,
-                'remaining': max(0, remaining_after),
-                'original_qty': original_qty,
-                'impact_applied': impact,
-                'position_after': position,
-                'cash_after': cash,
-            })
+            remaining_qty[i] = remaining_after
+            executed[i] = remaining_after <= 0
+            trades.append(bar, order_side[i], fill_qty, price, effective_price, commission,
+                          max(0, remaining_after), original_qty, impact, position, cash)
             # Update cumulative participation after applying fill
             if bar_volume and bar_volume > 0 and cum_volume > 0:
                 cumulative_participation = min(1.0, (prev_abs_qty + fill_qty) / cum_volume)
         # Mark-to-market
-        mtm = position * float(row['Close'])
-        equity = cash + mtm
-        equity_values.append((date, equity))
-        gross_exposure_peak = max(gross_exposure_peak, abs(position) * float(row['Close']))
+        mtm = position * price
+        equity_values[bar] = cash + mtm
+        gross_exposure_peak = max(gross_exposure_peak, abs(position) * price)
 
-    equity_series = pd.Series([v for _, v in equity_values], index=[d for d, _ in equity_values])
-    returns = equity_series.pct_change().dropna()
-    sharpe = _compute_sharpe(returns)
-    max_dd = _compute_max_drawdown(equity_series)
-    total_commission = sum(t.get('commission', 0.0) for t in trades)
-    # Slippage cost per trade approximated as difference between effective and mid (here close) * qty
-    total_slip_cost = 0.0
-    for t in trades:
-        px = t.get('price')
-        epx = t.get('effective_price')
-        qty = t.get('qty', 0)
-        if px is not None and epx is not None:
-            # For buys effective > price (cost), for sells effective < price (cost as price-epx)
-            if t.get('side') == 'BUY':
-                total_slip_cost += (epx - px) * qty
-            else:
-                total_slip_cost += (px - epx) * qty
-    total_notional = sum((t.get('effective_price', 0.0) or 0.0) * t.get('qty', 0) for t in trades)
-    total_trades = len(trades)
-    avg_cost_bps = 0.0
-    if total_notional > 0:
-        avg_cost_bps = ((total_commission + total_slip_cost) / total_notional) * 10000.0
-    return BacktestResult(
-        total_return=returns.sum(),
-        sharpe_ratio=sharpe,
-        max_drawdown=max_dd,
-        total_trades=total_trades,
-        win_rate=len([t for t in trades if t['side'] == 'SELL' and t.get('remaining', 0) == 0]) / total_trades if total_trades > 0 else 0.0,
-        final_portfolio_value=equity_series.iloc[-1] if not equity_series.empty else 0.0,
-    )
+    equity_series = pd.Series(equity_values, index=prices.index)
+    return _summarize(equity_series, trades)
 
 
 def multi_backtest(
-    price_map: Mapping[str, pd.DataFrame],
+    price_map: Mapping[str, Union[pd.DataFrame, PriceSeries]],
     orders: List[Dict[str, Any]],
     commission_pct: float = 0.0005,
     slippage_bps: int = 5,
@@ -384,33 +477,43 @@ def multi_backtest(
     impact_coef: float = 0.0,
     impact_model: str = 'linear',
     impact_power: float = 0.5,
+    n_jobs: int = 1,
 ) -> BacktestResult:
     """Multi-symbol backtest aggregating equity across symbols with optional costs.
 
-    price_map: symbol -> DataFrame with Close column & DateTimeIndex (or 'Date' column).
+    price_map: symbol -> DataFrame with Close column & DateTimeIndex (or 'Date' column),
+    or an already built ``PriceSeries``.
     Orders must include symbol field.
     Costs: commission_pct * notional and slippage_bps modify effective execution price.
+    n_jobs: worker processes for the per-symbol fast path (joblib semantics). Defaults to
+    serial; process start-up only pays off for long histories or many orders per symbol.
+    When no participation cap or impact model couples fills to shared volume state and
+    all symbols share one calendar, symbols are simulated independently and summed.
     """
     # Normalize all indices & align dates
-    norm = {}
+    norm: Dict[str, PriceSeries] = {}
     for sym, df in price_map.items():
+        if isinstance(df, PriceSeries):
+            if len(df):
+                norm[sym] = df
+            continue
         if df is None or df.empty or 'Close' not in df.columns:
             continue
-        local = df.copy()
-        if not isinstance(local.index, pd.DatetimeIndex):
-            if 'Date' in local.columns:
-                local = local.set_index(pd.to_datetime(local['Date']))
-            else:
-                continue
-        norm[sym] = local[['Close']]
+        if not isinstance(df.index, pd.DatetimeIndex) and 'Date' not in df.columns:
+            continue
+        norm[sym] = PriceSeries.from_df(df)
     if not norm:
         raise ValueError("No valid price data provided")
     # Master calendar
-    all_dates = sorted(set().union(*[df.index for df in norm.values()]))
+    all_dates = sorted(set().union(*[ps.index for ps in norm.values()]))
+    all_ts = np.array([_to_naive_datetime64(d) for d in all_dates], dtype='datetime64[ns]')
+    # Bar of each symbol in effect on each calendar date (-1 before its first bar)
+    asof = {sym: _asof_positions(ps.ts, all_ts) for sym, ps in norm.items()}
     cash = 100000.0
     positions: Dict[str, int] = {s: 0 for s in norm.keys()}
-    trades: List[Dict[str, Any]] = []
-    equity_points: List[tuple] = []
+    sym_codes: Dict[str, int] = {s: i for i, s in enumerate(norm)}
+    trades = TradeLog(all_dates, slippage_bps, symbols=list(norm))
+    equity_points = np.empty(len(all_dates), dtype=np.float64)
     # Pre-group orders by symbol for efficiency
     sym_orders: Dict[str, List[Dict[str, Any]]] = {}
     for o in orders:
@@ -418,129 +521,173 @@ def multi_backtest(
         if not isinstance(sym, str):
             continue
         sym_orders.setdefault(sym, []).append(o)
+    if (n_jobs != 1 and sum(1 for s in sym_orders if s in norm) > 1
+            and _symbols_independent(norm, participation_cap, impact_coef)):
+        return _multi_backtest_parallel(
+            norm, sym_orders, n_jobs,
+            commission_pct=commission_pct,
+            slippage_bps=slippage_bps,
+            base_spread_bps=base_spread_bps,
+            impact_model=impact_model,
+            impact_power=impact_power,
+        )
     slip = slippage_bps / 10000.0
     gross_exposure_peak = 0.0
     cumulative_participation: Dict[str, float] = {s: 0.0 for s in norm}
     cum_volume: Dict[str, float] = {s: 0.0 for s in norm}
-    for date in all_dates:
+    # Parse orders once per symbol; fill state is kept in arrays, not on the order dicts
+    sym_order_arrays = {sym: _order_arrays(olist) for sym, olist in sym_orders.items()}
+    sym_state = {
+        sym: (np.zeros(len(olist), dtype=bool), sym_order_arrays[sym][2].copy())
+        for sym, olist in sym_orders.items()
+    }
+    for bar, date in enumerate(all_dates):
+        date_ts = all_ts[bar]
         # Execute orders with timestamp <= date
-        for sym, olist in sym_orders.items():
-            sym_df = norm.get(sym)
-            if sym_df is None:
+        for sym in sym_orders:
+            ps = norm.get(sym)
+            if ps is None:
                 continue
-            mask = sym_df.index <= date
-            if not mask.any():
+            pos = asof[sym][bar]
+            if pos < 0:
                 continue
-            today_px_row = sym_df.loc[mask].tail(1)
-            if today_px_row.empty:
-                continue
-            price = float(today_px_row.iloc[-1]['Close'])
-            for o in olist:
-                if o.get('_executed'):
-                    continue
-                ts = o.get('timestamp')
-                try:
-                    ts_dt = pd.to_datetime(ts) if ts is not None else None
-                except Exception:
-                    ts_dt = None
-                if ts_dt and ts_dt <= date:
-                    side = o['side']
-                    original_qty = int(o['qty'])
-                    remaining = int(o.get('_remaining', original_qty))
-                    bar_volume = float(today_px_row.get('Volume', 1.0)) if participation_cap else None
-                    if participation_cap and bar_volume and bar_volume > 0:
-                        max_bar_qty = max(1, int(bar_volume * participation_cap))
-                        fill_qty = min(remaining, max_bar_qty)
-                    else:
-                        fill_qty = remaining
-                    spread_adj = 0.0
-                    if participation_cap:
-                        spread_adj = (base_spread_bps / 10000.0) * price * (1 if side == 'BUY' else -1)
-                    effective_price = price + spread_adj
-                    effective_price = effective_price * (1 + slip) if side == 'BUY' else effective_price * (1 - slip)
-                    if bar_volume and bar_volume > 0:
-                        cum_volume[sym] += bar_volume
-                    impact = 0.0
-                    prev_abs_qty = 0.0
-                    if impact_coef > 0 and cum_volume[sym] > 0:
-                        prev_abs_qty = cumulative_participation[sym] * cum_volume[sym]
-                        prospective = (prev_abs_qty + fill_qty) / cum_volume[sym]
-                        if impact_model == 'sqrt':
-                            scale = prospective ** 0.5
-                        elif impact_model == 'power':
-                            scale = prospective ** max(1e-6, impact_power)
-                        else:
-                            scale = prospective
-                        impact = impact_coef * scale * price
-                        effective_price = effective_price + (impact if side == 'BUY' else -impact)
-                    notional = fill_qty * effective_price
-                    commission = notional * commission_pct
-                    if side == 'BUY':
-                        cash -= notional + commission
-                        positions[sym] += fill_qty
-                    else:
-                        cash += notional - commission
-                        positions[sym] -= fill_qty
-                    remaining_after = remaining - fill_qty
-                    if remaining_after > 0:
-                        o['_remaining'] = remaining_after
+            price = float(ps.close[pos])
+            order_ts, order_side, order_qty = sym_order_arrays[sym]
+            executed, remaining_qty = sym_state[sym]
+            for i in np.flatnonzero((order_ts <= date_ts) & ~executed):
+                is_buy = order_side[i] == 1
+                original_qty = int(order_qty[i])
+                remaining = int(remaining_qty[i])
+                # Bars count as unit volume in the multi-symbol engine
+                bar_volume = 1.0 if participation_cap else None
+                if participation_cap and bar_volume and bar_volume > 0:
+                    max_bar_qty = max(1, int(bar_volume * participation_cap))
+                    fill_qty = min(remaining, max_bar_qty)
+                else:
+                    fill_qty = remaining
+                spread_adj = 0.0
+                if participation_cap:
+                    spread_adj = (base_spread_bps / 10000.0) * price * (1 if is_buy else -1)
+                effective_price = price + spread_adj
+                effective_price = effective_price * (1 + slip) if is_buy else effective_price * (1 - slip)
+                if bar_volume and bar_volume > 0:
+                    cum_volume[sym] += bar_volume
+                impact = 0.0
+                prev_abs_qty = 0.0
+                if impact_coef > 0 and cum_volume[sym] > 0:
+                    prev_abs_qty = cumulative_participation[sym] * cum_volume[sym]
+                    prospective = (prev_abs_qty + fill_qty) / cum_volume[sym]
+                    if impact_model == 'sqrt':
+                        scale = prospective ** 0.5
+                    elif impact_model == 'power':
+                        scale = prospective ** max(1e-6, impact_power)
                     else:
-                        o['_executed'] = True
-                    trades.append({
-                        'date': date,
-                        'symbol': sym,
-                        'side': side,
-                        'qty': fill_qty,
-                        'price': price,
-                        'effective_price': effective_price,
-                        'commission': commission,
-                        'slippage_bps': slippage_bps,
-                        'cash_after': cash,
-                        'position_after': positions[sym],
-                        'remaining': max(0, remaining_after),
-                        'original_qty': original_qty,
-                        'impact_applied': impact,
-                    })
-                    if bar_volume and bar_volume > 0 and cum_volume[sym] > 0:
-                        cumulative_participation[sym] = min(1.0, (prev_abs_qty + fill_qty) / cum_volume[sym])
+                        scale = prospective
+                    impact = impact_coef * scale * price
+                    effective_price = effective_price + (impact if is_buy else -impact)
+                notional = fill_qty * effective_price
+                commission = notional * commission_pct
+                if is_buy:
+                    cash -= notional + commission
+                    positions[sym] += fill_qty
+                else:
+                    cash += notional - commission
+                    positions[sym] -= fill_qty
+                remaining_after = remaining - fill_qty
+                remaining_qty[i] = remaining_after
+                executed[i] = remaining_after <= 0
+                trades.append(bar, order_side[i], fill_qty, price, effective_price, commission,
+                              max(0, remaining_after), original_qty, impact, positions[sym], cash,
+                              symbol=sym_codes[sym])
+                if bar_volume and bar_volume > 0 and cum_volume[sym] > 0:
+                    cumulative_participation[sym] = min(1.0, (prev_abs_qty + fill_qty) / cum_volume[sym])
         # Mark-to-market aggregated
         mtm = 0.0
+        gross_exp = 0.0  # Gross exposure = sum |qty * price|
         for sym, qty in positions.items():
             if qty == 0:
                 continue
-            sym_df = norm[sym]
-            px_row = sym_df.loc[sym_df.index <= date].tail(1)
-            if px_row.empty:
-                continue
-            mtm += qty * float(px_row.iloc[-1]['Close'])
-        equity_value = cash + mtm
-        equity_points.append((date, equity_value))
-        # Gross exposure = sum |qty * price|
-        gross_exp = 0.0
-        for s, q in positions.items():
-            if q == 0:
-                continue
-            px_row = norm[s].loc[norm[s].index <= date].tail(1)
-            if px_row.empty:
+            pos = asof[sym][bar]
+            if pos < 0:
                 continue
-            gross_exp += abs(q) * float(px_row.iloc[-1]['Close'])
+            value = qty * float(norm[sym].close[pos])
+            mtm += value
+            gross_exp += abs(value)
+        equity_points[bar] = cash + mtm
         gross_exposure_peak = max(gross_exposure_peak, gross_exp)
-    equity_series = pd.Series([v for _, v in equity_points], index=[d for d, _ in equity_points])
+    equity_series = pd.Series(equity_points, index=pd.Index(all_dates))
+    return _summarize(equity_series, trades)
+
+
+def _asof_positions(bar_ts: np.ndarray, dates: np.ndarray) -> np.ndarray:
+    """Index of the last bar at or before each date, in the series' own order; -1 if none."""
+    if np.all(bar_ts[1:] >= bar_ts[:-1]):
+        return np.searchsorted(bar_ts, dates, side='right') - 1
+    out = np.full(dates.size, -1, dtype=np.intp)
+    for k, d in enumerate(dates):
+        hits = np.flatnonzero(bar_ts <= d)
+        if hits.size:
+            out[k] = hits[-1]
+    return out
+
+
+def _symbols_independent(norm: Mapping[str, PriceSeries],
+                         participation_cap: Optional[float],
+                         impact_coef: float) -> bool:
+    """Whether each symbol can be simulated on its own and the results summed.
+
+    Cash is the only state shared across symbols and it is unconstrained, so
+    per-symbol runs are additive as long as fills do not depend on the volume
+    bookkeeping and every symbol trades on the same sorted calendar.
+    """
+    if participation_cap or impact_coef > 0:
+        return False
+    series = list(norm.values())
+    first = series[0].index
+    if not (first.is_monotonic_increasing and first.is_unique):
+        return False
+    return all(ps.index.equals(first) for ps in series[1:])
+
+
+def _multi_backtest_parallel(norm: Mapping[str, PriceSeries],
+                             sym_orders: Mapping[str, List[Dict[str, Any]]],
+                             n_jobs: int,
+                             **cost_kwargs: Any) -> BacktestResult:
+    """Run one single-symbol backtest per symbol across worker processes."""
+    symbols = list(norm)
+    active = [s for s in sym_orders if s in norm]
+    results = Parallel(n_jobs=n_jobs, backend='loky')(
+        delayed(backtest)(norm[s], sym_orders[s], **cost_kwargs) for s in active
+    )
+    initial_cash = 100000.0
+    equity_series = sum(r.equity_curve for r in results) - (len(results) - 1) * initial_cash
+    # Re-interleave fills in serial order (date, then symbol) and rebuild shared cash
+    codes = np.concatenate([np.full(len(r.trade_log), symbols.index(s), dtype=np.int32)
+                            for s, r in zip(active, results)])
+    ranks = np.concatenate([np.full(len(r.trade_log), rank, dtype=np.int32)
+                            for rank, r in enumerate(results)])
+    logs = [r.trade_log for r in results]
+    bars = np.concatenate([log.bar[:log.n] for log in logs])
+    order = np.lexsort((ranks, bars))
+    trades = TradeLog(equity_series.index, cost_kwargs.get('slippage_bps', 5), symbols=symbols,
+                      capacity=len(order))
+    for name in ('side',) + TradeLog._INT_COLUMNS + TradeLog._FLOAT_COLUMNS:
+        setattr(trades, name, np.concatenate([getattr(log, name)[:log.n] for log in logs])[order])
+    trades.symbol = codes[order]
+    cash_deltas = np.concatenate([np.diff(log.cash_after[:log.n], prepend=initial_cash) for log in logs])
+    trades.cash_after = initial_cash + np.cumsum(cash_deltas[order])
+    trades.n = len(order)
+    return _summarize(equity_series, trades)
+
+
+def _summarize(equity_series: pd.Series, trades: TradeLog) -> BacktestResult:
     returns = equity_series.pct_change().dropna()
     sharpe = _compute_sharpe(returns)
     max_dd = _compute_max_drawdown(equity_series)
-    total_commission = sum(t.get('commission', 0.0) for t in trades)
-    total_slip_cost = 0.0
-    for t in trades:
-        px = t.get('price')
-        epx = t.get('effective_price')
-        qty = t.get('qty', 0)
-        if px is not None and epx is not None:
-            if t.get('side') == 'BUY':
-                total_slip_cost += (epx - px) * qty
-            else:
-                total_slip_cost += (px - epx) * qty
-    total_notional = sum((t.get('effective_price', 0.0) or 0.0) * t.get('qty', 0) for t in trades)
+    total_commission = trades.total_commission()
+    # Slippage cost per trade approximated as difference between effective and mid (here close) * qty
+    total_slip_cost = trades.total_slip_cost()
+    total_notional = trades.total_notional()
     total_trades = len(trades)
     avg_cost_bps = 0.0
     if total_notional > 0:
@@ -550,9 +697,11 @@ def multi_backtest(
         sharpe_ratio=sharpe,
         max_drawdown=max_dd,
         total_trades=total_trades,
-        win_rate=len([t for t in trades if t['side'] == 'SELL' and t.get('remaining', 0) == 0]) / total_trades if total_trades > 0 else 0.0,
+        win_rate=trades.closed_sells() / total_trades if total_trades > 0 else 0.0,
         final_portfolio_value=equity_series.iloc[-1] if not equity_series.empty else 0.0,
+        trade_log=trades,
+        equity_curve=equity_series,
     )
 
 
-__all__ = ["BacktestService", "BacktestResult", "backtest", "_compute_sharpe", "_compute_max_drawdown"]
+__all__ = ["BacktestService", "BacktestResult", "TradeLog", "PriceSeries", "PreparedBacktest", "precompile", "backtest", "multi_backtest", "_compute_sharpe", "_compute_max_drawdown"]
@@ -6,7 +6,92 @@ from core.db.models import Portfolio, Position, TradeRecord
 from sqlalchemy.orm import Session
 import pandas as pd
 import numpy as np
-from sqlalchemy import func
+from sqlalchemy import case, func, insert, select, update
+from collections.abc import Mapping
+from concurrent.futures import Future
+from dataclasses import dataclass
+from enum import IntEnum
+import asyncio
+import atexit
+import itertools
+import queue
+import threading
+
+from services._risk_nb import _max_drawdown_nb
+
+def _trade_columns(symbol: str, side: "_Side", quantity: float, price: float,
+                   commission: float, slippage: float, now: datetime) -> Dict[str, Any]:
+    """``TradeRecord`` column values for one executed trade."""
+    return {
+        "ticker": symbol,
+        "trade_date": now,
+        "trade_type": side.name,
+        "quantity": quantity,
+        "price": price,
+        "commission": commission,
+        "total_cost": quantity * price + commission,
+        # The trade table has no slippage column; keep it with the record
+        "notes": f"slippage={slippage}" if slippage else None,
+    }
+
+
+def _update_avg_price(qty: float, avg: float, dq: float, dp: float) -> Tuple[float, float]:
+    """New quantity and weighted average price after buying ``dq`` at ``dp``."""
+    new_qty = qty + dq
+    return new_qty, (qty * avg + dq * dp) / new_qty
+
+
+@dataclass(slots=True, eq=False)
+class RebalanceAction(Mapping):
+    """A trade proposed by ``allocate_positions``.
+    
+    ``reason`` is only formatted when read. The record is a read-only mapping
+    with the keys of the previous dict form (``symbol``, ``action``,
+    ``quantity``, ``price``, ``reason``), so the list can be passed straight
+    to ``execute_trades``; use ``to_dict`` where a real dict is needed,
+    e.g. for JSON.
+    """
+    symbol: str
+    action: str
+    quantity: float
+    price: float
+    current_value: float
+    target_value: float
+    
+    _KEYS = ("symbol", "action", "quantity", "price", "reason")
+    
+    @property
+    def reason(self) -> str:
+        verb = "reduce" if self.action == "SELL" else "increase"
+        return f"Rebalance: {verb} {self.symbol} from {self.current_value:.2f} to {self.target_value:.2f}"
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __iter__(self):
+        return iter(self._KEYS)
+    
+    def __len__(self) -> int:
+        return len(self._KEYS)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in self._KEYS}
+
+
+class _Side(IntEnum):
+    BUY = 0
+    SELL = 1
+
+
+def _parse_side(action: str) -> _Side:
+    """Map a BUY/SELL action string (any case) to its _Side, validating it once."""
+    try:
+        return _Side[action.upper()]
+    except KeyError:
+        raise ValueError("Action must be either BUY or SELL") from None
+
 
 class PortfolioService:
     """Service for portfolio management and position tracking."""
@@ -14,6 +99,8 @@ class PortfolioService:
     def __init__(self, portfolio_id: Optional[int] = None, portfolio_name: Optional[str] = None):
         """Initialize with either an existing portfolio ID or create a new one."""
         self.db = next(get_db())
+        self._writer: Optional[_TradeWriter] = None
+        self._writer_lock = threading.Lock()
         
         if portfolio_id:
             # Load existing portfolio
@@ -29,18 +116,25 @@ class PortfolioService:
         else:
             raise ValueError("Either portfolio_id or portfolio_name must be provided")
     
-    def get_position(self, symbol: str) -> Optional[Position]:
-        """Get current position for a symbol."""
-        return self.db.query(Position).filter(
+    def get_position(self, symbol: str, for_update: bool = False) -> Optional[Position]:
+        """Get current position for a symbol.
+        
+        With ``for_update`` the row stays locked until the session commits, so
+        concurrent trades on the same symbol apply one after the other.
+        """
+        stmt = select(Position).where(
             Position.portfolio_id == self.portfolio.id,
-            Position.symbol == symbol
-        ).first()
+            Position.ticker == symbol
+        )
+        if for_update:
+            stmt = stmt.with_for_update()
+        return self.db.execute(stmt).scalar_one_or_none()
     
     def get_all_positions(self) -> List[Position]:
         """Get all current positions in the portfolio."""
-        return self.db.query(Position).filter(
-            Position.portfolio_id == self.portfolio.id
-        ).all()
+        return self.db.execute(
+            select(Position).where(Position.portfolio_id == self.portfolio.id)
+        ).scalars().all()
     
     def execute_trade(self, 
                       symbol: str, 
@@ -50,9 +144,162 @@ class PortfolioService:
                       commission: float = 0.0,
                       slippage: float = 0.0) -> TradeRecord:
         """Execute a trade and update portfolio state."""
-        # Validate inputs
-        if action.upper() not in ["BUY", "SELL"]:
-            raise ValueError("Action must be either BUY or SELL")
+        side = _parse_side(action)
+        now = datetime.utcnow()
+        try:
+            self._lock_portfolio()
+            position = self.get_position(symbol, for_update=True)
+            self._apply_trade(position, symbol, side, quantity, price, commission, now)
+            
+            # Create trade record
+            trade = TradeRecord(
+                portfolio_id=self.portfolio.id,
+                **_trade_columns(symbol, side, quantity, price, commission, slippage, now)
+            )
+            self.db.add(trade)
+            
+            # Commit changes
+            self.portfolio.updated_at = now
+            self.db.commit()
+        except Exception:
+            # Release the row lock and drop partial changes on rejection
+            self.db.rollback()
+            raise
+        self.db.refresh(trade)
+        
+        return trade
+    
+    def execute_trades(self, trades: List[Dict[str, Any]]) -> List[int]:
+        """Execute a batch of trades in a single transaction.
+        
+        Each trade dict takes the keyword arguments of ``execute_trade``.
+        Positions for all symbols are loaded with one SELECT and trade records
+        are written with one multi-row INSERT. If any trade fails validation
+        the whole batch is rolled back.
+        
+        Returns:
+            Ids of the inserted trade records, in trade order
+        """
+        if not trades:
+            return []
+        
+        symbols = {t["symbol"] for t in trades}
+        records = []
+        try:
+            self._lock_portfolio()
+            positions = {
+                p.ticker: p
+                for p in self.db.execute(
+                    select(Position).where(
+                        Position.portfolio_id == self.portfolio.id,
+                        Position.ticker.in_(symbols)
+                    ).with_for_update()
+                ).scalars()
+            }
+            
+            for t in trades:
+                # Per-trade timestamp keeps trade_date ordering within the batch
+                now = datetime.utcnow()
+                symbol = t["symbol"]
+                side = _parse_side(t["action"])
+                commission = t.get("commission", 0.0)
+                position = self._apply_trade(
+                    positions.get(symbol), symbol, side, t["quantity"], t["price"], commission, now
+                )
+                if position is None:
+                    # Flush the delete now so a later buy in the batch can
+                    # insert the symbol again without hitting the unique index
+                    positions.pop(symbol, None)
+                    self.db.flush()
+                else:
+                    positions[symbol] = position
+                records.append({
+                    "portfolio_id": self.portfolio.id,
+                    **_trade_columns(symbol, side, t["quantity"], t["price"], commission,
+                                     t.get("slippage", 0.0), now),
+                })
+            
+            trade_ids = self.db.execute(
+                insert(TradeRecord).returning(TradeRecord.id, sort_by_parameter_order=True), records
+            ).scalars().all()
+            self.portfolio.updated_at = now
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        return list(trade_ids)
+    
+    def submit_trade(self,
+                     symbol: str,
+                     action: str,
+                     quantity: float,
+                     price: float,
+                     commission: float = 0.0,
+                     slippage: float = 0.0) -> Future:
+        """Queue a trade for the background writer instead of committing inline.
+        
+        The writer thread owns its own session and commits queued trades in
+        batches through ``execute_trades``. The returned future resolves to
+        the trade id once committed, or raises the trade's validation error.
+        This session does not see the writes until it is refreshed (see
+        ``close_writer``).
+        """
+        trade = {
+            "symbol": symbol,
+            "action": action,
+            "quantity": quantity,
+            "price": price,
+            "commission": commission,
+            "slippage": slippage,
+        }
+        # Submit under the lock so a concurrent close_writer cannot close the
+        # writer between the lookup and the submit
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = _TradeWriter(self.portfolio.id)
+            return self._writer.submit(trade)
+    
+    async def asubmit_trade(self, *args: Any, **kwargs: Any) -> int:
+        """Queue a trade with ``submit_trade`` and await its commit without blocking the event loop.
+        
+        Unlike ``execute_trade`` this returns the committed trade id, not a
+        ``TradeRecord``; the record is written by the writer's own session.
+        """
+        return await asyncio.wrap_future(self.submit_trade(*args, **kwargs))
+    
+    def close_writer(self) -> None:
+        """Commit all queued trades, stop the writer and expire this session's cached state."""
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.close()
+            self.db.expire_all()
+    
+    def _lock_portfolio(self) -> None:
+        """Reload the portfolio row under FOR UPDATE before changing its cash.
+        
+        Other sessions (the background writer, other service instances) commit
+        cash changes too, so the cached balance may be stale. Locking the row
+        first serialises trades on the portfolio; it is always taken before
+        any position locks.
+        """
+        self.db.refresh(self.portfolio, with_for_update=True)
+    
+    def _apply_trade(self,
+                     position: Optional[Position],
+                     symbol: str,
+                     side: _Side,
+                     quantity: float,
+                     price: float,
+                     commission: float,
+                     now: datetime) -> Optional[Position]:
+        """Validate a trade and apply it to cash and the symbol's position.
+        
+        Returns the position after the trade, or None if it was closed out.
+        Changes are left pending on the session for the caller to commit.
+        """
+        # Validate inputs (the side was validated by _parse_side)
         if quantity <= 0:
             raise ValueError("Quantity must be positive")
         if price <= 0:
@@ -63,156 +310,168 @@ class PortfolioService:
         total_cost = trade_value + commission
         
         # Check if we have enough cash for buys
-        if action.upper() == "BUY" and total_cost > self.portfolio.cash:
+        if side is _Side.BUY and total_cost > self.portfolio.cash:
             raise ValueError(f"Insufficient cash: {self.portfolio.cash} < {total_cost}")
         
         # Check if we have enough shares for sells
-        position = self.get_position(symbol)
-        if action.upper() == "SELL":
+        if side is _Side.SELL:
             if not position or position.quantity < quantity:
                 raise ValueError(f"Insufficient shares: {position.quantity if position else 0} < {quantity}")
         
         # Update cash
-        if action.upper() == "BUY":
+        if side is _Side.BUY:
             self.portfolio.cash -= total_cost
         else:  # SELL
             self.portfolio.cash += trade_value - commission
         
         # Update position
-        if action.upper() == "BUY":
+        if side is _Side.BUY:
             if position:
                 # Update existing position with weighted average price
-                new_total = position.quantity + quantity
-                position.avg_price = ((position.quantity * position.avg_price) + (quantity * price)) / new_total
-                position.quantity = new_total
-                position.last_price = price
-                position.last_updated = datetime.utcnow()
+                position.quantity, position.average_cost = _update_avg_price(
+                    position.quantity, position.average_cost, quantity, price
+                )
+                position.current_price = price
+                position.updated_at = now
             else:
                 # Create new position
                 position = Position(
                     portfolio_id=self.portfolio.id,
-                    symbol=symbol,
+                    ticker=symbol,
                     quantity=quantity,
-                    avg_price=price,
-                    last_price=price
+                    average_cost=price,
+                    current_price=price
                 )
                 self.db.add(position)
         else:  # SELL
             # Reduce position
             position.quantity -= quantity
-            position.last_price = price
-            position.last_updated = datetime.utcnow()
+            position.current_price = price
+            position.updated_at = now
             
             # Remove position if quantity is zero
             if position.quantity <= 0:
                 self.db.delete(position)
+                return None
         
-        # Create trade record
-        trade = TradeRecord(
-            symbol=symbol,
-            trade_date=datetime.utcnow(),
-            action=action.upper(),
-            quantity=quantity,
-            price=price,
-            commission=commission,
-            slippage=slippage,
-            trade_id=f"{datetime.utcnow().timestamp()}-{symbol}",
-            portfolio_id=self.portfolio.id
-        )
-        self.db.add(trade)
-        
-        # Commit changes
-        self.portfolio.last_updated = datetime.utcnow()
-        self.db.commit()
-        self.db.refresh(trade)
-        
-        return trade
+        return position
     
     def update_positions_price(self, prices: Dict[str, float]) -> None:
         """Update the last price of all positions."""
-        positions = self.get_all_positions()
-        for position in positions:
-            if position.symbol in prices:
-                position.last_price = prices[position.symbol]
-                position.last_updated = datetime.utcnow()
+        now = datetime.utcnow()
+        if prices:
+            # One UPDATE ... CASE statement instead of loading and dirtying each row
+            self.db.execute(
+                update(Position)
+                .where(Position.portfolio_id == self.portfolio.id)
+                .where(Position.ticker.in_(list(prices)))
+                .values(
+                    current_price=case(prices, value=Position.ticker),
+                    updated_at=now
+                )
+            )
         
-        self.portfolio.last_updated = datetime.utcnow()
+        self.portfolio.updated_at = now
         self.db.commit()
     
     def get_portfolio_value(self) -> Tuple[float, float, float]:
         """Get current portfolio value (cash + positions)."""
-        positions = self.get_all_positions()
-        positions_value = sum(p.quantity * p.last_price for p in positions)
+        positions_value = self._sum_positions_value_sql()
         total_value = self.portfolio.cash + positions_value
         return self.portfolio.cash, positions_value, total_value
     
+    def _sum_positions_value_sql(self) -> float:
+        """Market value of all positions, summed in the database."""
+        return float(self.db.execute(
+            select(func.coalesce(func.sum(Position.quantity * Position.current_price), 0.0))
+            .where(Position.portfolio_id == self.portfolio.id)
+        ).scalar())
+    
     def get_portfolio_returns(self, days: int = 30) -> pd.DataFrame:
         """Calculate portfolio returns over the specified period."""
         # Get trades within the period
-        cutoff_date = datetime.utcnow() - pd.Timedelta(days=days)
-        trades = self.db.query(TradeRecord).filter(
-            TradeRecord.portfolio_id == self.portfolio.id,
-            TradeRecord.trade_date >= cutoff_date
-        ).order_by(TradeRecord.trade_date).all()
+        now = datetime.utcnow()
+        cutoff_date = now - pd.Timedelta(days=days)
+        # Only the replayed columns are selected and rows are streamed in
+        # chunks, so no TradeRecord objects are hydrated
+        trades = iter(self.db.execute(
+            select(
+                TradeRecord.trade_date,
+                TradeRecord.trade_type.label("action"),
+                TradeRecord.ticker.label("symbol"),
+                TradeRecord.quantity,
+                TradeRecord.price,
+                TradeRecord.commission
+            )
+            .where(
+                TradeRecord.portfolio_id == self.portfolio.id,
+                TradeRecord.trade_date >= cutoff_date
+            )
+            .order_by(TradeRecord.trade_date)
+            .execution_options(yield_per=1000)
+        ))
+        first_trade = next(trades, None)
         
         # If no trades, return empty DataFrame
-        if not trades:
+        if first_trade is None:
             return pd.DataFrame(columns=["date", "portfolio_value"])
         
         # Create daily portfolio snapshots
         dates = pd.date_range(
-            start=trades[0].trade_date.date(),
-            end=datetime.utcnow().date(),
+            start=first_trade.trade_date.date(),
+            end=now.date(),
             freq="B"  # Business days
         )
         
-        portfolio_values = []
+        # Replay trades once in date order; each trade's effect on cash and on
+        # the book value of positions is bucketed onto its business day
+        day_index = {day: i for i, day in enumerate(dates.date)}
+        cash_delta = np.zeros(len(dates))
+        value_delta = np.zeros(len(dates))
         current_positions = {}
-        current_cash = self.portfolio.cash
-        
-        # Reconstruct portfolio history
-        for date in dates:
-            # Apply trades for this date
-            day_trades = [t for t in trades if t.trade_date.date() == date.date()]
-            for trade in day_trades:
-                if trade.action == "BUY":
-                    if trade.symbol not in current_positions:
-                        current_positions[trade.symbol] = {"qty": 0, "price": 0}
-                    
-                    # Update position with weighted average price
-                    current_qty = current_positions[trade.symbol]["qty"]
-                    current_price = current_positions[trade.symbol]["price"]
-                    new_qty = current_qty + trade.quantity
-                    if new_qty > 0:
-                        new_price = ((current_qty * current_price) + (trade.quantity * trade.price)) / new_qty
-                        current_positions[trade.symbol] = {"qty": new_qty, "price": new_price}
-                    
-                    # Update cash
-                    current_cash -= (trade.quantity * trade.price + trade.commission)
+        
+        for trade in itertools.chain([first_trade], trades):
+            # Trades that fall outside the business-day calendar are not replayed
+            idx = day_index.get(trade.trade_date.date())
+            if idx is None:
+                continue
+            
+            old_pos = current_positions.get(trade.symbol)
+            old_value = old_pos["qty"] * old_pos["price"] if old_pos else 0.0
+            
+            if trade.action == "BUY":
+                if trade.symbol not in current_positions:
+                    current_positions[trade.symbol] = {"qty": 0, "price": 0}
+                
+                # Update position with weighted average price
+                current_qty = current_positions[trade.symbol]["qty"]
+                current_price = current_positions[trade.symbol]["price"]
+                new_qty = current_qty + trade.quantity
+                if new_qty > 0:
+                    new_price = ((current_qty * current_price) + (trade.quantity * trade.price)) / new_qty
+                    current_positions[trade.symbol] = {"qty": new_qty, "price": new_price}
                 
-                elif trade.action == "SELL":
-                    # Update position
-                    current_positions[trade.symbol]["qty"] -= trade.quantity
-                    if current_positions[trade.symbol]["qty"] <= 0:
-                        del current_positions[trade.symbol]
-                    
-                    # Update cash
-                    current_cash += (trade.quantity * trade.price - trade.commission)
+                # Update cash
+                cash_delta[idx] -= (trade.quantity * trade.price + trade.commission)
             
-            # Calculate portfolio value for this date
-            positions_value = sum(
-                pos["qty"] * pos["price"] 
-                for pos in current_positions.values()
-            )
-            total_value = current_cash + positions_value
+            elif trade.action == "SELL":
+                # Update position
+                current_positions[trade.symbol]["qty"] -= trade.quantity
+                if current_positions[trade.symbol]["qty"] <= 0:
+                    del current_positions[trade.symbol]
+                
+                # Update cash
+                cash_delta[idx] += (trade.quantity * trade.price - trade.commission)
             
-            portfolio_values.append({
-                "date": date,
-                "portfolio_value": total_value
-            })
+            new_pos = current_positions.get(trade.symbol)
+            new_value = new_pos["qty"] * new_pos["price"] if new_pos else 0.0
+            value_delta[idx] += new_value - old_value
+        
+        # Portfolio value for each date from the running totals
+        portfolio_value = self.portfolio.cash + np.cumsum(cash_delta) + np.cumsum(value_delta)
         
         # Convert to DataFrame
-        df = pd.DataFrame(portfolio_values)
+        df = pd.DataFrame({"date": dates, "portfolio_value": portfolio_value})
         
         # Calculate daily returns
         if len(df) > 1:
@@ -221,17 +480,38 @@ class PortfolioService:
         
         return df
     
+    def _has_sufficient_history(self, days: int) -> bool:
+        """Whether ``get_portfolio_returns(days)`` would span more than one business day.
+        
+        Only the earliest trade date in the window is fetched, so portfolios
+        without enough history skip the full reconstruction.
+        """
+        now = datetime.utcnow()
+        first_trade = self.db.execute(
+            select(func.min(TradeRecord.trade_date)).where(
+                TradeRecord.portfolio_id == self.portfolio.id,
+                TradeRecord.trade_date >= now - pd.Timedelta(days=days)
+            )
+        ).scalar()
+        if first_trade is None:
+            return False
+        return len(pd.bdate_range(first_trade.date(), now.date())) > 1
+    
     def get_risk_metrics(self) -> Dict[str, float]:
         """Calculate portfolio risk metrics."""
+        default_metrics = {
+            "volatility": 0.0,
+            "sharpe_ratio": 0.0,
+            "max_drawdown": 0.0,
+            "var_95": 0.0
+        }
+        if not self._has_sufficient_history(days=60):
+            return default_metrics
+        
         returns = self.get_portfolio_returns(days=60)
         
         if len(returns) <= 1 or "daily_return" not in returns:
-            return {
-                "volatility": 0.0,
-                "sharpe_ratio": 0.0,
-                "max_drawdown": 0.0,
-                "var_95": 0.0
-            }
+            return default_metrics
         
         # Calculate metrics
         daily_returns = returns["daily_return"].dropna().values
@@ -244,10 +524,7 @@ class PortfolioService:
         sharpe_ratio = (mean_daily_return * 252) / volatility if volatility > 0 else 0
         
         # Maximum drawdown
-        cum_returns = (1 + returns["daily_return"].fillna(0)).cumprod()
-        max_return = cum_returns.cummax()
-        drawdown = (cum_returns / max_return) - 1
-        max_drawdown = drawdown.min()
+        max_drawdown = _max_drawdown_nb(returns["daily_return"].to_numpy(dtype=np.float64))
         
         # Value at Risk (95%)
         var_95 = np.percentile(daily_returns, 5)
@@ -259,7 +536,7 @@ class PortfolioService:
             "var_95": float(var_95)
         }
     
-    def allocate_positions(self, allocations: Dict[str, float], max_position_pct: float = 0.25) -> List[Dict]:
+    def allocate_positions(self, allocations: Dict[str, float], max_position_pct: float = 0.25) -> List[RebalanceAction]:
         """
         Allocate portfolio based on target weights.
         
@@ -268,7 +545,7 @@ class PortfolioService:
             max_position_pct: Maximum allocation for any single position (0-1)
             
         Returns:
-            List of trades to execute
+            List of RebalanceAction trades to execute
         """
         # Validate inputs
         if not allocations:
@@ -283,9 +560,13 @@ class PortfolioService:
             for symbol, alloc in allocations.items()
         }
         
-        # Get current portfolio state
-        cash, positions_value, total_value = self.get_portfolio_value()
-        positions = {p.symbol: p for p in self.get_all_positions()}
+        # Get current portfolio state, loading positions once
+        positions = {p.ticker: p for p in self.get_all_positions()}
+        held = list(positions)
+        held_price = np.array([positions[s].current_price for s in held], dtype=np.float64)
+        held_value = np.array([positions[s].quantity for s in held], dtype=np.float64) * held_price
+        cash = self.portfolio.cash
+        total_value = cash + float(held_value.sum())
         
         # Calculate target position values
         target_values = {
@@ -297,53 +578,48 @@ class PortfolioService:
         trades_to_execute = []
         
         # First, handle sells to free up cash
-        for symbol, position in positions.items():
-            current_value = position.quantity * position.last_price
-            target_value = target_values.get(symbol, 0)
-            
-            if current_value > target_value:
-                # Need to sell
-                sell_value = current_value - target_value
-                sell_quantity = sell_value / position.last_price
-                
-                trades_to_execute.append({
-                    "symbol": symbol,
-                    "action": "SELL",
-                    "quantity": sell_quantity,
-                    "price": position.last_price,
-                    "reason": f"Rebalance: reduce {symbol} from {current_value:.2f} to {target_value:.2f}"
-                })
+        held_target = np.array([target_values.get(s, 0) for s in held], dtype=np.float64)
+        
+        sells = np.flatnonzero(held_value > held_target)
+        sell_quantity = (held_value[sells] - held_target[sells]) / held_price[sells]
+        for i, quantity in zip(sells, sell_quantity):
+            symbol = held[i]
+            trades_to_execute.append(RebalanceAction(
+                symbol=symbol,
+                action="SELL",
+                quantity=float(quantity),
+                price=positions[symbol].current_price,
+                current_value=float(held_value[i]),
+                target_value=float(held_target[i])
+            ))
         
         # Then, handle buys with updated cash
-        updated_cash = cash + sum(
-            t["quantity"] * t["price"] 
-            for t in trades_to_execute
-        )
+        updated_cash = cash + float(np.dot(sell_quantity, held_price[sells]))
         
-        for symbol, target_value in target_values.items():
-            current_value = 0
-            current_price = 0
-            
-            if symbol in positions:
-                position = positions[symbol]
-                current_value = position.quantity * position.last_price
-                current_price = position.last_price
-            
-            if current_value < target_value and current_price > 0:
-                # Need to buy
-                buy_value = min(target_value - current_value, updated_cash)
-                if buy_value > 0:
-                    buy_quantity = buy_value / current_price
-                    
-                    trades_to_execute.append({
-                        "symbol": symbol,
-                        "action": "BUY",
-                        "quantity": buy_quantity,
-                        "price": current_price,
-                        "reason": f"Rebalance: increase {symbol} from {current_value:.2f} to {target_value:.2f}"
-                    })
-                    
-                    updated_cash -= buy_value
+        wanted = list(target_values)
+        target = np.fromiter(target_values.values(), dtype=np.float64, count=len(wanted))
+        current_value = np.array(
+            [positions[s].quantity * positions[s].current_price if s in positions else 0.0 for s in wanted],
+            dtype=np.float64
+        )
+        current_price = np.array([positions[s].current_price if s in positions else 0.0 for s in wanted], dtype=np.float64)
+        
+        buys = np.flatnonzero((current_value < target) & (current_price > 0))
+        # Buys are filled greedily in target order until the cash runs out
+        filled = np.minimum(np.cumsum(target[buys] - current_value[buys]), updated_cash)
+        buy_value = np.diff(filled, prepend=0.0)
+        for i, value in zip(buys, buy_value):
+            if value <= 0:
+                continue
+            symbol = wanted[i]
+            trades_to_execute.append(RebalanceAction(
+                symbol=symbol,
+                action="BUY",
+                quantity=float(value / current_price[i]),
+                price=positions[symbol].current_price,
+                current_value=float(current_value[i]),
+                target_value=float(target[i])
+            ))
         
         return trades_to_execute
     
@@ -371,4 +647,83 @@ class PortfolioService:
             return trade_record is not None
         except Exception as e:
             logger.error(f"Error updating position: {e}")
-            return False
\ No newline at end of file
+            return False
+
+
+class _TradeWriter:
+    """Background thread that commits queued trades for one portfolio in batches."""
+    
+    def __init__(self, portfolio_id: int, max_batch: int = 1000):
+        self.portfolio_id = portfolio_id
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Optional[Tuple[Dict[str, Any], Future]]]" = queue.Queue()
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f"trade-writer-{portfolio_id}", daemon=True)
+        self._thread.start()
+        # The thread is a daemon so it never blocks exit on an idle queue;
+        # flush whatever is still queued when the interpreter shuts down
+        atexit.register(self.close)
+    
+    def submit(self, trade: Dict[str, Any]) -> Future:
+        future: Future = Future()
+        with self._close_lock:
+            # Nothing queued behind the stop sentinel would ever be committed
+            if self._closed:
+                future.set_exception(RuntimeError("Trade writer is closed"))
+            else:
+                self._queue.put((trade, future))
+        return future
+    
+    def close(self) -> None:
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        atexit.unregister(self.close)
+        self._thread.join()
+    
+    def _run(self) -> None:
+        # Sessions are not thread-safe, so the writer works on its own
+        try:
+            service = PortfolioService(portfolio_id=self.portfolio_id)
+        except Exception as e:
+            # Fail everything queued until close() so no caller waits forever
+            for _, future in iter(self._queue.get, None):
+                future.set_exception(e)
+            return
+        try:
+            stopping = False
+            while not stopping:
+                item = self._queue.get()
+                if item is None:
+                    break
+                batch = [item]
+                while len(batch) < self.max_batch:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+                self._commit(service, batch)
+        finally:
+            service.db.close()
+    
+    @staticmethod
+    def _commit(service: PortfolioService, batch: List[Tuple[Dict[str, Any], Future]]) -> None:
+        try:
+            trade_ids = service.execute_trades([trade for trade, _ in batch])
+        except Exception:
+            # The batch was rolled back; replay one by one so only the bad trades fail
+            for trade, future in batch:
+                try:
+                    future.set_result(service.execute_trades([trade])[0])
+                except Exception as e:
+                    future.set_exception(e)
+            return
+        for (_, future), trade_id in zip(batch, trade_ids):
+            future.set_result(trade_id)
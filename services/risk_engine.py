@@ -5,10 +5,57 @@ Provides portfolio exposure aggregation and simple stop logic utilities.
 This is intentionally lightweight; can evolve toward more sophisticated
 risk models (VaR, volatility targeting, etc.).
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Mapping, Tuple
+import hashlib
+import threading
+import numpy as np
 import pandas as pd
 import math
-from collections import defaultdict
+from collections import OrderedDict
+
+from services._risk_nb import _var_nb, _vol_nb, _window_prices
+
+
+class _MetricCache:
+    """Thread-safe LRU of risk metrics keyed on the contents of the input array.
+
+    Debate loops re-score the same price history many times; the key is a
+    short digest of the whole buffer, so a changed value anywhere misses.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Tuple[str, float, int, bytes], float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, name: str, prices: np.ndarray, param: float,
+                       compute: Callable[[np.ndarray, float], float]) -> float:
+        key = (name, param, prices.size, hashlib.blake2b(prices.tobytes(), digest_size=8).digest())
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+                return value
+        value = float(compute(prices, param))
+        with self._lock:
+            self._data[key] = value
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_metric_cache = _MetricCache(maxsize=256)
+
+
+def _as_prices(data: Any) -> np.ndarray:
+    """Contiguous float64 view of a list, mapping or Series of values."""
+    if isinstance(data, Mapping):
+        data = list(data.values())
+    return np.ascontiguousarray(data, dtype=np.float64)
 
 
 class RiskEngine:
@@ -24,19 +71,20 @@ class RiskEngine:
             market_data = portfolio_data.get('market_data', {})
             
             # Calculate basic risk metrics
-            total_exposure = sum(abs(pos['quantity'] * pos.get('current_price', 0)) for pos in positions)
+            quantity = np.fromiter((pos['quantity'] for pos in positions), dtype=np.float64, count=len(positions))
+            price = np.fromiter((pos.get('current_price', 0) for pos in positions), dtype=np.float64, count=len(positions))
+            total_exposure = float(np.abs(quantity * price).sum())
             
             # Calculate VaR if historical data is available
             var_95 = 0.0
             if 'historical_returns' in portfolio_data:
-                returns = pd.Series(portfolio_data['historical_returns'])
-                var_95 = self.historical_var(returns, confidence=0.95)
+                returns = _as_prices(portfolio_data['historical_returns'])
+                var_95 = self._var(returns, confidence=0.95)
             
             # Calculate volatility
             volatility = 0.0
             if 'price_series' in portfolio_data:
-                price_series = pd.Series(portfolio_data['price_series'])
-                volatility = self.volatility(price_series)
+                volatility = self._vol(_as_prices(portfolio_data['price_series']))
             
             return {
                 'total_exposure': total_exposure,
@@ -50,110 +98,92 @@ class RiskEngine:
     
     def aggregate_exposure(self, orders: List[Dict[str, Any]]) -> Dict[str, float]:
         """Aggregate exposure by symbol from a list of orders."""
-        exposure = defaultdict(float)
-        for order in orders:
-            symbol = order.get('symbol', '')
-            quantity = order.get('quantity', 0)
-            exposure[symbol] += quantity
-        return dict(exposure)
+        return aggregate_exposure(orders)
     
     def apply_stop_losses(self, positions: Dict[str, Dict[str, Any]], 
                          price_map: Dict[str, float], 
                          stop_pct: float = 0.1) -> List[Dict[str, Any]]:
         """Apply stop loss logic to positions."""
-        stops_triggered = []
-        for symbol, position in positions.items():
-            if symbol in price_map:
-                current_price = price_map[symbol]
-                entry_price = position.get('avg_price', current_price)
-                
-                # Check for stop loss
-                if current_price <= entry_price * (1 - stop_pct):
-                    stops_triggered.append({
-                        'symbol': symbol,
-                        'action': 'SELL',
-                        'quantity': position.get('quantity', 0),
-                        'reason': f'Stop loss triggered at {stop_pct*100}%'
-                    })
-        return stops_triggered
+        return apply_stop_losses(positions, price_map, stop_pct)
     
     def historical_var(self, price_series: pd.Series, confidence: float = 0.95) -> float:
         """Calculate historical Value at Risk."""
         if price_series is None or price_series.empty:
             return 0.0
-        returns = price_series.pct_change().dropna()
-        if returns.empty:
-            return 0.0
-        sorted_returns = returns.sort_values()
-        index = int((1 - confidence) * len(sorted_returns))
-        if index < 0:
-            index = 0
-        var = -sorted_returns.iloc[index]
-        return float(var)
+        return self._var(np.ascontiguousarray(price_series.to_numpy(dtype=np.float64)), confidence)
     
     def volatility(self, price_series: pd.Series, window: int = 20) -> float:
         """Calculate rolling volatility."""
-        if price_series is None or price_series.empty:
-            return 0.0
-        returns = price_series.pct_change().dropna().tail(window)
-        if returns.empty:
+        if price_series is None or len(price_series) < 2:
             return 0.0
-        vol = returns.std() * math.sqrt(252)
-        return float(vol) if not math.isnan(vol) else 0.0
+        return self._vol(np.ascontiguousarray(_window_prices(price_series, window)), window)
+    
+    @staticmethod
+    def _var(prices: np.ndarray, confidence: float = 0.95) -> float:
+        return _metric_cache.get_or_compute('var', prices, confidence, _var_nb)
+    
+    @staticmethod
+    def _vol(prices: np.ndarray, window: int = 20) -> float:
+        vol = _metric_cache.get_or_compute('vol', prices, window, _vol_nb)
+        return vol if not math.isnan(vol) else 0.0
 
 
 # Keep standalone functions for backward compatibility
 def aggregate_exposure(orders: List[Dict[str, Any]]) -> Dict[str, float]:
-    """Aggregate exposure by symbol from a list of orders."""
-    exposure = defaultdict(float)
-    for order in orders:
-        symbol = order.get('symbol', '')
-        quantity = order.get('quantity', 0)
-        exposure[symbol] += quantity
-    return dict(exposure)
+    """Aggregate net exposure by symbol from a list of orders.
+    
+    SELL orders (``action`` or ``side``) count negatively. Quantities are
+    gathered into one array and summed per symbol with a single groupby.
+    """
+    if not orders:
+        return {}
+    n = len(orders)
+    symbols = [order.get('symbol', '') for order in orders]
+    quantity = np.fromiter((order.get('quantity', 0) for order in orders), dtype=np.float64, count=n)
+    is_sell = np.fromiter(((order.get('action') or order.get('side')) == 'SELL' for order in orders),
+                          dtype=bool, count=n)
+    totals = pd.Series(np.where(is_sell, -quantity, quantity)).groupby(symbols, sort=False, dropna=False).sum()
+    return {symbol: float(total) for symbol, total in totals.items()}
 
 def apply_stop_losses(positions: Dict[str, Dict[str, Any]], 
                      price_map: Dict[str, float], 
                      stop_pct: float = 0.1) -> List[Dict[str, Any]]:
-    """Apply stop loss logic to positions."""
-    stops_triggered = []
-    for symbol, position in positions.items():
-        if symbol in price_map:
-            current_price = price_map[symbol]
-            entry_price = position.get('avg_price', current_price)
-            
-            # Check for stop loss
-            if current_price <= entry_price * (1 - stop_pct):
-                stops_triggered.append({
-                    'symbol': symbol,
-                    'action': 'SELL',
-                    'quantity': position.get('quantity', 0),
-                    'reason': f'Stop loss triggered at {stop_pct*100}%'
-                })
-    return stops_triggered
+    """Apply stop loss logic to positions.
+    
+    Prices are gathered into arrays once and the stop condition is evaluated
+    for all priced symbols in a single vectorized comparison; result dicts are
+    only built for the triggered ones.
+    """
+    symbols = [symbol for symbol in positions if symbol in price_map]
+    if not symbols:
+        return []
+    current = np.fromiter((price_map[s] for s in symbols), dtype=np.float64, count=len(symbols))
+    # Entry defaults to the current price, which never triggers a stop
+    entry = np.fromiter((positions[s].get('avg_price', price_map[s]) for s in symbols),
+                        dtype=np.float64, count=len(symbols))
+    triggered = np.flatnonzero(current <= entry * (1 - stop_pct))
+    reason = f'Stop loss triggered at {stop_pct*100}%'
+    return [
+        {
+            'symbol': symbols[i],
+            'action': 'SELL',
+            'quantity': positions[symbols[i]].get('quantity', 0),
+            'reason': reason
+        }
+        for i in triggered
+    ]
 
 def historical_var(price_series: pd.Series, confidence: float = 0.95) -> float:
     """Calculate historical Value at Risk."""
     if price_series is None or price_series.empty:
         return 0.0
-    returns = price_series.pct_change().dropna()
-    if returns.empty:
-        return 0.0
-    sorted_returns = returns.sort_values()
-    index = int((1 - confidence) * len(sorted_returns))
-    if index < 0:
-        index = 0
-    var = -sorted_returns.iloc[index]
-    return float(var)
+    return float(_var_nb(price_series.to_numpy(dtype=np.float64), confidence))
 
 def volatility(price_series: pd.Series, window: int = 20) -> float:
     """Calculate rolling volatility."""
-    if price_series is None or price_series.empty:
-        return 0.0
-    returns = price_series.pct_change().dropna().tail(window)
-    if returns.empty:
+    if price_series is None or len(price_series) < 2:
         return 0.0
-    vol = returns.std() * math.sqrt(252)
+    vol = _vol_nb(_window_prices(price_series, window), window)
     return float(vol) if not math.isnan(vol) else 0.0
 
 __all__ = ["RiskEngine", "aggregate_exposure", "apply_stop_losses", "historical_var", "volatility"]
@@ -4,19 +4,27 @@ from __future__ import annotations
 Provides:
  - rolling_volatility: estimates annualized volatility from price history
  - compute_position_size: converts signal confidence & volatility into size pct
+ - compute_position_size_vec: the same sizing over arrays of signals
 
 This is intentionally simple and can be extended to Kelly, risk parity, etc.
 """
 from typing import Optional
+import numpy as np
 import pandas as pd
 import math
 
+from services._risk_nb import _vol_nb, _window_prices
+
 
 class SizingService:
     """Position sizing service for the trading system."""
     
     def __init__(self, config: dict):
         self.config = config
+        # Sizing bounds are fixed per service; resolve them once instead of per call
+        self._max_pct = config.get('max_position_pct', 0.1)
+        self._target_risk_vol = config.get('target_risk_vol', 0.25)
+        self._min_pct = config.get('min_position_pct', 0.01)
     
     def calculate_position_size(self, account_balance: float, 
                                risk_tolerance: float, 
@@ -29,25 +37,18 @@ class SizingService:
             # Get confidence from market data
             confidence = market_data.get('confidence', 0.5)  # Default 50% confidence
             
-            # Use the existing function
-            return self.compute_position_size(
-                confidence=confidence,
-                volatility=volatility,
-                max_pct=self.config.get('max_position_pct', 0.1),
-                target_risk_vol=self.config.get('target_risk_vol', 0.25),
-                min_pct=self.config.get('min_position_pct', 0.01)
-            )
+            if confidence <= 0 or volatility <= 0:
+                return 0.0
+            # Same sizing as compute_position_size with the configured bounds
+            return float(max(self._min_pct, min(self._max_pct, confidence / volatility * self._target_risk_vol)))
         except Exception as e:
             return 0.0
     
     def rolling_volatility(self, price_series: pd.Series, window: int = 20) -> float:
         """Estimate annualized volatility from price history."""
-        if price_series is None or price_series.empty:
-            return 0.0
-        returns = price_series.pct_change().dropna().tail(window)
-        if returns.empty:
+        if price_series is None or len(price_series) < 2:
             return 0.0
-        vol = returns.std() * math.sqrt(252)
+        vol = _vol_nb(_window_prices(price_series, window), window)
         return float(vol) if not math.isnan(vol) else 0.0
     
     def compute_position_size(self,
@@ -70,17 +71,23 @@ class SizingService:
         position_size = max(min_pct, min(max_pct, risk_adjusted_size))
         
         return float(position_size)
+    
+    def compute_position_size_vec(self,
+                                  confidence: np.ndarray,
+                                  volatility: np.ndarray,
+                                  max_pct: float,
+                                  target_risk_vol: float = 0.25,
+                                  min_pct: float = 0.01) -> np.ndarray:
+        """Vectorized compute_position_size over per-symbol arrays."""
+        return compute_position_size_vec(confidence, volatility, max_pct, target_risk_vol, min_pct)
 
 
 # Keep standalone functions for backward compatibility
 def rolling_volatility(price_series: pd.Series, window: int = 20) -> float:
     """Estimate annualized volatility from price history."""
-    if price_series is None or price_series.empty:
+    if price_series is None or len(price_series) < 2:
         return 0.0
-    returns = price_series.pct_change().dropna().tail(window)
-    if returns.empty:
-        return 0.0
-    vol = returns.std() * math.sqrt(252)
+    vol = _vol_nb(_window_prices(price_series, window), window)
     return float(vol) if not math.isnan(vol) else 0.0
 
 def compute_position_size(confidence: float,
@@ -103,4 +110,23 @@ def compute_position_size(confidence: float,
     
     return float(position_size)
 
-__all__ = ["SizingService", "rolling_volatility", "compute_position_size"]
+def compute_position_size_vec(confidence: np.ndarray,
+                              volatility: np.ndarray,
+                              max_pct: float,
+                              target_risk_vol: float = 0.25,
+                              min_pct: float = 0.01) -> np.ndarray:
+    """Vectorized compute_position_size over per-symbol arrays.
+    
+    Element-wise identical to the scalar version, including the 0.0 size for
+    non-positive confidence or volatility, but sizes a whole portfolio with a
+    handful of ufunc passes instead of one Python call per symbol.
+    """
+    confidence = np.asarray(confidence, dtype=np.float64)
+    volatility = np.asarray(volatility, dtype=np.float64)
+    active = (confidence > 0) & (volatility > 0)
+    # Masked-out entries divide by 1.0 instead of 0 so no warnings are raised
+    risk_adjusted = confidence / np.where(active, volatility, 1.0) * target_risk_vol
+    position_size = np.maximum(min_pct, np.minimum(max_pct, risk_adjusted))
+    return np.where(active, position_size, 0.0)
+
+__all__ = ["SizingService", "rolling_volatility", "compute_position_size", "compute_position_size_vec"]
@@ -42,8 +42,9 @@ class StreamingService:
             if not self.streamer:
                 return False
             
-            # Register our internal callback
-            self.streamer.register_callback(self._on_market_update)
+            # Register our internal callback once; later calls only add symbols
+            if self._on_market_update not in self.streamer.callbacks:
+                self.streamer.register_callback(self._on_market_update)
             
             # Start the stream
             success = self.streamer.start_stream(symbols)
@@ -85,6 +86,16 @@ class StreamingService:
             return self.streamer.get_latest_data(symbol)
         return {}
     
+    def get_latest_prices(self) -> Dict[str, float]:
+        """Get the last streamed price of every symbol in one call.
+        
+        Reads the streamer's own price map instead of issuing a
+        ``get_latest_data`` lookup (a network fetch for Yahoo) per symbol.
+        """
+        if self.streamer:
+            return self.streamer.latest_prices_snapshot()
+        return {}
+    
     def is_streaming(self) -> bool:
         """Check if streaming is active."""
         return self.streamer and self.streamer.is_connected()
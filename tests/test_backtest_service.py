@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.backtest_service import backtest, multi_backtest
+
+
+def _price_map(symbols, periods=120, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2024-01-01", periods=periods, freq="B")
+    return {
+        sym: pd.DataFrame(
+            {
+                "Close": 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, periods))),
+                "Volume": rng.integers(10_000, 50_000, periods),
+            },
+            index=dates,
+        )
+        for sym in symbols
+    }
+
+
+def _orders(price_map, every=7):
+    orders = []
+    for k, (sym, df) in enumerate(price_map.items()):
+        for i, ts in enumerate(df.index[k::every]):
+            orders.append(
+                {
+                    "symbol": sym,
+                    "timestamp": ts,
+                    "side": "BUY" if i % 2 == 0 else "SELL",
+                    "qty": 10 + k,
+                }
+            )
+    return sorted(orders, key=lambda o: o["timestamp"])
+
+
+@pytest.mark.parametrize(
+    "costs",
+    [
+        {},
+        {"commission_pct": 0.001, "slippage_bps": 10, "base_spread_bps": 4},
+    ],
+)
+def test_multi_backtest_parallel_matches_serial(costs):
+    price_map = _price_map(["AAA", "BBB", "CCC"])
+    orders = _orders(price_map)
+
+    serial = multi_backtest(price_map, orders, n_jobs=1, **costs)
+    parallel = multi_backtest(price_map, orders, n_jobs=2, **costs)
+
+    assert parallel.total_trades == serial.total_trades > 0
+    assert parallel.final_portfolio_value == pytest.approx(serial.final_portfolio_value)
+    assert parallel.total_return == pytest.approx(serial.total_return)
+    assert parallel.sharpe_ratio == pytest.approx(serial.sharpe_ratio)
+    assert parallel.max_drawdown == pytest.approx(serial.max_drawdown)
+    assert parallel.win_rate == pytest.approx(serial.win_rate)
+    pd.testing.assert_series_equal(
+        parallel.equity_curve, serial.equity_curve, check_names=False, check_freq=False
+    )
+    for p, s in zip(parallel.trades, serial.trades, strict=True):
+        assert p.keys() == s.keys()
+        for key in s:
+            if isinstance(s[key], float):
+                assert p[key] == pytest.approx(s[key]), key
+            else:
+                assert p[key] == s[key], key
+
+
+def test_multi_backtest_defaults_to_serial(monkeypatch):
+    import services.backtest_service as bs
+
+    def fail(*args, **kwargs):
+        raise AssertionError("parallel path used without n_jobs")
+
+    monkeypatch.setattr(bs, "_multi_backtest_parallel", fail)
+    price_map = _price_map(["AAA", "BBB"])
+    result = multi_backtest(price_map, _orders(price_map))
+    assert result.total_trades > 0
+
+
+def test_backtest_sees_in_place_price_edits():
+    df = _price_map(["AAA"], periods=20)["AAA"]
+    orders = [
+        {"timestamp": df.index[2], "side": "BUY", "qty": 10},
+        {"timestamp": df.index[10], "side": "SELL", "qty": 10},
+    ]
+    before = backtest(df, orders)
+    df.loc[df.index[10], "Close"] *= 2
+    after = backtest(df, orders)
+    assert after.final_portfolio_value > before.final_portfolio_value
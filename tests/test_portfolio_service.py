@@ -0,0 +1,182 @@
+import asyncio
+import json
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+import services.portfolio_service as ps
+from core.db.connection import Base
+from core.db.models import Portfolio, Position, TradeRecord
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    # A file database so the background writer's session sees the same data
+    engine = create_engine(f"sqlite:///{tmp_path / 'portfolio.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(ps, "get_db", lambda: iter([factory()]))
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+def service(session_factory):
+    service = ps.PortfolioService(portfolio_name="test")
+    service.portfolio.cash = 1_000.0
+    service.db.commit()
+    yield service
+    service.close_writer()
+    service.db.close()
+
+
+def _stored(session_factory, portfolio_id):
+    """Cash, positions and trade count as committed to the database."""
+    with session_factory() as db:
+        cash = db.get(Portfolio, portfolio_id).cash
+        positions = {
+            p.ticker: p.quantity
+            for p in db.scalars(
+                select(Position).where(Position.portfolio_id == portfolio_id)
+            )
+        }
+        trades = db.scalar(
+            select(func.count())
+            .select_from(TradeRecord)
+            .where(TradeRecord.portfolio_id == portfolio_id)
+        )
+    return cash, positions, trades
+
+
+def test_execute_trade_updates_position(service, session_factory):
+    service.execute_trade("AAPL", "BUY", 10, 20.0, commission=1.0)
+    trade = service.execute_trade("AAPL", "buy", 10, 30.0)
+
+    assert trade.ticker == "AAPL" and trade.trade_type == "BUY"
+    assert trade.total_cost == pytest.approx(300.0)
+    position = service.get_position("AAPL")
+    assert position.quantity == 20
+    assert position.average_cost == pytest.approx(25.0)
+    assert _stored(session_factory, service.portfolio.id) == (499.0, {"AAPL": 20}, 2)
+
+
+@pytest.mark.parametrize(
+    "action, quantity, price",
+    [
+        ("SELL", 5, 10.0),  # no shares held
+        ("BUY", 500, 10.0),  # more than the available cash
+        ("BUY", 0, 10.0),  # non-positive quantity
+    ],
+)
+def test_rejected_trade_rolls_back(service, session_factory, action, quantity, price):
+    service.execute_trade("MSFT", "BUY", 1, 10.0)
+
+    with pytest.raises(ValueError):
+        service.execute_trade("AAPL", action, quantity, price)
+
+    assert not service.db.in_transaction()
+    assert service.portfolio.cash == 990.0
+    assert _stored(session_factory, service.portfolio.id) == (990.0, {"MSFT": 1}, 1)
+    # The session is still usable after the rollback
+    service.execute_trade("MSFT", "SELL", 1, 10.0)
+    assert _stored(session_factory, service.portfolio.id) == (1_000.0, {}, 2)
+
+
+def test_rejected_batch_rolls_back(service, session_factory):
+    trades = [
+        {"symbol": "AAPL", "action": "BUY", "quantity": 10, "price": 10.0},
+        {"symbol": "MSFT", "action": "SELL", "quantity": 5, "price": 10.0},
+    ]
+    with pytest.raises(ValueError):
+        service.execute_trades(trades)
+
+    assert service.portfolio.cash == 1_000.0
+    assert _stored(session_factory, service.portfolio.id) == (1_000.0, {}, 0)
+
+
+def test_update_positions_price(service):
+    service.execute_trades(
+        [
+            {"symbol": "AAPL", "action": "BUY", "quantity": 2, "price": 10.0},
+            {"symbol": "MSFT", "action": "BUY", "quantity": 3, "price": 20.0},
+        ]
+    )
+    service.update_positions_price({"AAPL": 12.0, "TSLA": 1.0})
+    service.db.expire_all()
+
+    assert {p.ticker: p.current_price for p in service.get_all_positions()} == {
+        "AAPL": 12.0,
+        "MSFT": 20.0,
+    }
+
+
+def test_portfolio_value(service):
+    assert service.get_portfolio_value() == (1_000.0, 0.0, 1_000.0)
+
+    service.execute_trade("AAPL", "BUY", 2, 100.0)
+    service.execute_trade("MSFT", "BUY", 1, 300.0)
+    service.update_positions_price({"AAPL": 150.0})
+
+    assert service.get_portfolio_value() == pytest.approx((500.0, 600.0, 1_100.0))
+
+
+def test_portfolio_returns(service):
+    empty = service.get_portfolio_returns()
+    assert empty.empty and list(empty.columns) == ["date", "portfolio_value"]
+
+    trade = service.execute_trade("AAPL", "BUY", 2, 100.0)
+    trade_day = (
+        pd.Timestamp.now("UTC").tz_localize(None) - pd.offsets.BDay(3)
+    ).normalize()
+    trade.trade_date = trade_day.to_pydatetime()
+    service.db.commit()
+
+    returns = service.get_portfolio_returns()
+    assert returns["date"].iloc[0] == trade_day
+    assert {"portfolio_value", "daily_return"} <= set(returns.columns)
+
+
+def test_allocate_positions_returns_mappings(service):
+    service.execute_trade("AAPL", "BUY", 4, 100.0)
+    service.execute_trade("MSFT", "BUY", 1, 100.0)
+
+    actions = service.allocate_positions({"AAPL": 0.2, "MSFT": 0.2})
+
+    assert [(a["symbol"], a["action"]) for a in actions] == [
+        ("AAPL", "SELL"),
+        ("MSFT", "BUY"),
+    ]
+    sell = actions[0]
+    assert "reason" in sell and "current_value" not in sell
+    assert dict(sell) == sell.to_dict()
+    assert json.loads(json.dumps(sell.to_dict()))["reason"].startswith(
+        "Rebalance: reduce AAPL"
+    )
+    assert sell["quantity"] == pytest.approx(2.0)
+
+    service.execute_trades(actions)
+    assert {p.ticker: p.quantity for p in service.get_all_positions()} == pytest.approx(
+        {"AAPL": 2.0, "MSFT": 2.0}
+    )
+
+
+def test_submitted_trades_commit_in_the_background(service, session_factory):
+    futures = [service.submit_trade("AAPL", "BUY", 1, 10.0) for _ in range(5)]
+    rejected = service.submit_trade("MSFT", "SELL", 1, 10.0)
+    writer = service._writer
+    service.close_writer()
+
+    assert len({f.result(timeout=5) for f in futures}) == 5
+    with pytest.raises(ValueError):
+        rejected.result(timeout=5)
+    assert _stored(session_factory, service.portfolio.id) == (950.0, {"AAPL": 5}, 5)
+
+    # A closed writer fails new trades instead of leaving them queued forever
+    with pytest.raises(RuntimeError):
+        writer.submit(
+            {"symbol": "AAPL", "action": "BUY", "quantity": 1, "price": 10.0}
+        ).result(timeout=5)
+    # The service starts a new writer on the next submit
+    assert asyncio.run(service.asubmit_trade("AAPL", "BUY", 1, 10.0)) > 0
@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import core.memory.simple_memory as sm
+from core.db.connection import Base
+
+
+@pytest.fixture
+def memory(monkeypatch):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(sm, "get_db", lambda: iter([factory()]))
+    monkeypatch.setattr(sm, "_cache", sm.OrderedDict())
+    monkeypatch.setattr(sm, "_generations", {})
+    yield sm.SimpleMemory("analyst")
+    engine.dispose()
+
+
+def test_writes_invalidate_cached_reads(memory):
+    memory.add_memory("first", "hold")
+    assert [m["situation"] for m in memory.get_recent_memories()] == ["first"]
+
+    memory.add_memory("second", "buy")
+    assert len(memory.get_recent_memories()) == 2
+
+
+def test_callers_cannot_mutate_the_cache(memory):
+    memory.add_memory("first", "hold")
+    memory.get_all_memories()[0]["situation"] = "changed"
+    memory.get_all_memories().clear()
+
+    assert [m["situation"] for m in memory.get_all_memories()] == ["first"]
+
+
+def test_read_started_before_a_write_is_not_cached(memory):
+    memory.add_memory("first", "hold")
+    _, generation = memory._cache_get("recent", 5)
+    memory.add_memory("second", "buy")
+    memory._cache_put("recent", 5, [{"situation": "stale"}], generation)
+
+    assert memory._cache_get("recent", 5)[0] is None
+
+
+def test_entries_expire(memory, monkeypatch):
+    memory.add_memory("first", "hold")
+    memory.get_recent_memories()
+    assert memory._cache_get("recent", 5)[0] is not None
+
+    now = sm.time.monotonic()
+    monkeypatch.setattr(sm.time, "monotonic", lambda: now + sm._CACHE_TTL + 1)
+    assert memory._cache_get("recent", 5)[0] is None
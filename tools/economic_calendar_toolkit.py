@@ -1,14 +1,73 @@
+import asyncio
+import httpx
+import orjson
 import requests
-from langchain_core.tools import tool
+from requests.adapters import HTTPAdapter
+from langchain_core.tools import StructuredTool, tool
 from typing import Dict, Any, List
 import logging
 from datetime import datetime, timedelta
+from functools import lru_cache
 import os
+import time
+import weakref
 
 logger = logging.getLogger(__name__)
 
-@tool
-def get_economic_events(start_date: str, end_date: str) -> str:
+# One keep-alive pool for every tool call instead of a new TCP+TLS handshake per request
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=0))
+
+# httpx clients are bound to the loop they first ran on, so keep one per running loop;
+# an entry goes away with its loop
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+def _async_client() -> httpx.AsyncClient:
+    """HTTP/2 client for the async tool paths, one per running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(http2=True, timeout=10, limits=httpx.Limits(max_connections=16))
+        _ASYNC_CLIENTS[loop] = client
+    return client
+
+async def aclose_async_client() -> None:
+    """Close the running loop's HTTP client; call before the loop shuts down."""
+    client = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+# Alpha Vantage macro series are monthly/quarterly; refetching them more often is wasted latency
+_AV_SERIES_TTL = 6 * 3600
+
+@lru_cache(maxsize=64)
+def _fetch_av_series(function: str, api_key: str, ttl_bucket: int) -> tuple:
+    """Full ``(date, value)`` history of an Alpha Vantage economic series.
+
+    ``ttl_bucket`` only takes part in the cache key so entries expire after
+    ``_AV_SERIES_TTL``. Responses without data (e.g. rate-limit notes) raise
+    instead of returning, so they are never cached.
+    """
+    url = f"https://www.alphavantage.co/query?function={function}&apikey={api_key}"
+    data = orjson.loads(_SESSION.get(url, timeout=10).content)
+    if "data" not in data:
+        raise LookupError(function)
+    return tuple((item["date"], item["value"]) for item in data["data"])
+
+def _economic_events_url(api_key: str, start_date: str, end_date: str) -> str:
+    return f"https://www.alphavantage.co/query?function=NEWS_SENTIMENT&topics=financial_markets&apikey={api_key}&time_from={start_date}T00:00:00&time_to={end_date}T23:59:59"
+
+def _format_economic_events(data: Dict[str, Any]) -> str:
+    if "feed" not in data:
+        return "No economic events found."
+    
+    events = []
+    for item in data["feed"][:10]:  # Limit to 10 events
+        events.append(f"Title: {item['title']}\nSummary: {item['summary']}\nSentiment: {item['overall_sentiment_label']}")
+    
+    return "\n\n".join(events)
+
+def _get_economic_events(start_date: str, end_date: str) -> str:
     """Retrieve economic events from Alpha Vantage or similar API."""
     try:
         # Using Alpha Vantage API (requires API key)
@@ -16,23 +75,33 @@ def get_economic_events(start_date: str, end_date: str) -> str:
         if not api_key:
             return "Alpha Vantage API key not configured."
         
-        url = f"https://www.alphavantage.co/query?function=NEWS_SENTIMENT&topics=financial_markets&apikey={api_key}&time_from={start_date}T00:00:00&time_to={end_date}T23:59:59"
-        
-        response = requests.get(url)
-        data = response.json()
-        
-        if "feed" not in data:
-            return "No economic events found."
-        
-        events = []
-        for item in data["feed"][:10]:  # Limit to 10 events
-            events.append(f"Title: {item['title']}\nSummary: {item['summary']}\nSentiment: {item['overall_sentiment_label']}")
+        response = _SESSION.get(_economic_events_url(api_key, start_date, end_date), timeout=10)
+        return _format_economic_events(orjson.loads(response.content))
+    except Exception as e:
+        logger.error(f"Error fetching economic events: {e}")
+        return f"Error fetching economic events: {e}"
+
+async def _aget_economic_events(start_date: str, end_date: str) -> str:
+    """Retrieve economic events from Alpha Vantage or similar API."""
+    try:
+        api_key = os.environ.get("ALPHA_VANTAGE_API_KEY")
+        if not api_key:
+            return "Alpha Vantage API key not configured."
         
-        return "\n\n".join(events)
+        response = await _async_client().get(_economic_events_url(api_key, start_date, end_date))
+        return _format_economic_events(orjson.loads(response.content))
     except Exception as e:
         logger.error(f"Error fetching economic events: {e}")
         return f"Error fetching economic events: {e}"
 
+# Sync calls keep using the requests pool; ainvoke (async graph runs) awaits the
+# HTTP/2 client so concurrent tool calls share one multiplexed connection.
+get_economic_events = StructuredTool.from_function(
+    func=_get_economic_events,
+    coroutine=_aget_economic_events,
+    name="get_economic_events",
+)
+
 @tool
 def get_fed_speeches(start_date: str, end_date: str) -> str:
     """Retrieve recent Federal Reserve speeches and statements."""
@@ -40,16 +109,16 @@ def get_fed_speeches(start_date: str, end_date: str) -> str:
         # Using FRED API or web scraping for Fed speeches
         # This is a simplified example - in practice, you'd use a proper API
         url = "https://www.federalreserve.gov/newsevents/speeches.htm"
-        response = requests.get(url)
+        response = _SESSION.get(url, timeout=10)
         
         # Parse HTML to extract recent speeches (simplified)
         from bs4 import BeautifulSoup
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml')
         
         speeches = []
-        for item in soup.find_all('div', class_='eventlist__event')[:5]:
-            title = item.find('h3').text.strip()
-            date = item.find('time')['datetime']
+        for item in soup.select('div.eventlist__event', limit=5):
+            title = item.select_one('h3').get_text(strip=True)
+            date = item.select_one('time')['datetime']
             speeches.append(f"Date: {date}\nTitle: {title}")
         
         return "\n\n".join(speeches) if speeches else "No recent Fed speeches found."
@@ -77,18 +146,13 @@ def get_economic_indicators(indicator: str, start_date: str, end_date: str) -> s
         if not function:
             return f"Unsupported indicator: {indicator}. Supported: {', '.join(indicator_map.keys())}"
         
-        url = f"https://www.alphavantage.co/query?function={function}&apikey={api_key}"
-        
-        response = requests.get(url)
-        data = response.json()
-        
-        if "data" not in data:
+        try:
+            series = _fetch_av_series(function, api_key, int(time.time() // _AV_SERIES_TTL))
+        except LookupError:
             return f"No data found for {indicator}."
         
         indicators = []
-        for item in data["data"]:
-            date = item["date"]
-            value = item["value"]
+        for date, value in series:
             if start_date <= date <= end_date:
                 indicators.append(f"Date: {date}\nValue: {value}")
         
@@ -3,9 +3,11 @@ Polygon.io WebSocket client for real-time market data.
 Requires: pip install polygon-api-client websockets
 """
 import asyncio
-import json
 import logging
-from typing import List, Dict, Any, Callable, Optional
+import threading
+import time
+from typing import List, Dict, Any, Callable, Optional, Tuple
+import orjson
 import websockets
 from polygon import WebSocketClient
 from polygon.websocket.models import WebSocketMessage
@@ -13,51 +15,109 @@ from polygon.enums import Feed, AssetClass
 
 logger = logging.getLogger(__name__)
 
+_MAX_BATCH = 128
+
+# Message class -> (carries symbol and price, has volume, has change_percent).
+# Polygon messages are fixed-shape dataclasses, so this is resolved once per type.
+_MESSAGE_FIELDS: Dict[type, Tuple[bool, bool, bool]] = {}
+
+
+def _message_fields(message: WebSocketMessage) -> Tuple[bool, bool, bool]:
+    cls = type(message)
+    fields = _MESSAGE_FIELDS.get(cls)
+    if fields is None:
+        fields = _MESSAGE_FIELDS[cls] = (
+            hasattr(message, 'symbol') and hasattr(message, 'price'),
+            hasattr(message, 'volume'),
+            hasattr(message, 'change_percent'),
+        )
+    return fields
+
 class PolygonStreamer:
     """Polygon.io WebSocket client for real-time market data."""
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.callbacks: List[Callable] = []
+        # Immutable copy iterated on every tick; rebuilt only when callbacks change
+        self._callbacks_snapshot: Tuple[Callable, ...] = ()
+        self._callbacks_lock = threading.Lock()
+        self.batch_callbacks: List[Callable] = []
+        self._batch_callbacks_snapshot: Tuple[Callable, ...] = ()
         self.is_streaming = False
         self.symbols: List[str] = []
+        self.last_prices: Dict[str, float] = {}
+        # Opt in to drop ticks whose price matches the last one dispatched for the symbol
+        self.dedup = config.get('dedup_ticks', False)
         self.client: Optional[WebSocketClient] = None
+        # Opt in to raw frames, which skip building a typed message object per tick
+        self.raw_messages = config.get('polygon_raw_messages', False)
+        # Ticks are queued by the message handler and dispatched in batches
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._consumer_task: Optional[asyncio.Task] = None
+        # Loop that owns the queue and dispatcher; the client may call back on another thread
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         
         # Get API key from config or secrets
         self.api_key = config.get('polygon_api_key') or get_secret('POLYGON_API_KEY')
     
     def register_callback(self, callback: Callable[[Dict[str, Any]], None]):
         """Register a callback for market data updates."""
-        self.callbacks.append(callback)
+        with self._callbacks_lock:
+            self.callbacks.append(callback)
+            self._callbacks_snapshot = tuple(self.callbacks)
         logger.info(f"Registered Polygon callback: {callback.__name__}")
     
+    def register_batch_callback(self, callback: Callable[[List[Dict[str, Any]]], None]):
+        """Register a callback that receives every drained batch of updates at once."""
+        with self._callbacks_lock:
+            self.batch_callbacks.append(callback)
+            self._batch_callbacks_snapshot = tuple(self.batch_callbacks)
+        logger.info(f"Registered Polygon batch callback: {callback.__name__}")
+    
     def unregister_callback(self, callback: Callable[[Dict[str, Any]], None]):
         """Unregister a callback."""
-        if callback in self.callbacks:
+        with self._callbacks_lock:
+            if callback not in self.callbacks:
+                return
             self.callbacks.remove(callback)
+            self._callbacks_snapshot = tuple(self.callbacks)
             logger.info(f"Unregistered callback: {callback.__name__}")
     
     def start_stream(self, symbols: List[str]) -> bool:
         """Start Polygon WebSocket stream for specified symbols."""
         try:
             if self.is_streaming:
-                logger.warning("Polygon stream already running")
+                # Subscribe on the open connection instead of reconnecting
+                new_symbols = [s for s in symbols if s not in self.symbols]
+                if new_symbols:
+                    self.client.subscribe(*new_symbols)
+                    self.symbols.extend(new_symbols)
+                    logger.info(f"Added Polygon subscriptions: {new_symbols}")
                 return True
             
-            self.symbols = symbols
+            self.symbols = list(symbols)
             self.is_streaming = True
             
+            # Callbacks run on the caller's loop, not on the client's network thread
+            try:
+                self._loop = asyncio.get_running_loop()
+                self._consumer_task = self._loop.create_task(self._dispatch_updates())
+            except RuntimeError:
+                self._loop = None
+            
             # Initialize Polygon client
             self.client = WebSocketClient(
                 api_key=self.api_key,
                 feed=Feed.RealTime,
                 market=AssetClass.Stocks,
+                raw=self.raw_messages,
                 verbose=False
             )
             
             # Register message handler
             self.client.subscribe(*symbols)
-            self.client.run_async(self._handle_message)
+            self.client.run_async(self._handle_raw_message if self.raw_messages else self._handle_message)
             
             logger.info(f"Started Polygon streaming for symbols: {symbols}")
             return True
@@ -73,6 +133,10 @@ class PolygonStreamer:
             if self.client:
                 self.client.close()
                 self.client = None
+            if self._consumer_task:
+                self._consumer_task.cancel()
+                self._consumer_task = None
+            self._loop = None
             logger.info("Stopped Polygon streaming")
         except Exception as e:
             logger.error(f"Error stopping Polygon stream: {e}")
@@ -84,28 +148,119 @@ class PolygonStreamer:
                 return
             
             # Process different message types
-            if hasattr(message, 'symbol') and hasattr(message, 'price'):
+            is_price, has_volume, has_change = _message_fields(message)
+            if is_price:
+                price = float(message.price)
+                if self.dedup and self.last_prices.get(message.symbol) == price:
+                    return
+                
                 update = {
                     'symbol': message.symbol,
-                    'price': float(message.price),
+                    'price': price,
                     'timestamp': time.time(),
-                    'volume': getattr(message, 'volume', 0),
-                    'change_percent': getattr(message, 'change_percent', 0),
+                    'volume': message.volume if has_volume else 0,
+                    'change_percent': message.change_percent if has_change else 0,
                     'source': 'polygon',
-                    'is_realtime': True,
-                    'last_updated': datetime.now().isoformat()
+                    'is_realtime': True
                 }
+                self.last_prices[update['symbol']] = update['price']
                 
-                # Notify all callbacks
-                for callback in self.callbacks:
-                    try:
-                        callback(update)
-                    except Exception as e:
-                        logger.error(f"Error in callback {callback.__name__}: {e}")
+                self._enqueue(update)
                         
         except Exception as e:
             logger.error(f"Error handling Polygon message: {e}")
     
+    async def _handle_raw_message(self, raw):
+        """Handle a raw WebSocket frame: a JSON array of events.
+        
+        Only trade events carry a price, which is all the typed handler
+        forwards for the stocks feed; other events are skipped without
+        being materialized.
+        """
+        try:
+            if not self.is_streaming:
+                return
+            
+            for event in orjson.loads(raw):
+                if event.get('ev') != 'T':
+                    continue
+                symbol = event['sym']
+                price = float(event['p'])
+                if self.dedup and self.last_prices.get(symbol) == price:
+                    continue
+                
+                # Same keys as the typed path; the trade size is reported as volume
+                update = {
+                    'symbol': symbol,
+                    'price': price,
+                    'timestamp': time.time(),
+                    'volume': event.get('s', 0),
+                    'change_percent': 0,
+                    'source': 'polygon',
+                    'is_realtime': True
+                }
+                self.last_prices[symbol] = price
+                
+                self._enqueue(update)
+                
+        except Exception as e:
+            logger.error(f"Error handling Polygon message: {e}")
+    
+    def _enqueue(self, update: Dict[str, Any]):
+        """Hand an update to the dispatcher loop from whichever thread received it."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        
+        if running is not None and (self._loop is None or running is self._loop):
+            if self._consumer_task is None:
+                # start_stream ran outside a loop; adopt the one delivering messages
+                self._loop = running
+                self._consumer_task = running.create_task(self._dispatch_updates())
+            self._queue.put_nowait(update)
+        elif self._loop is not None:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, update)
+        else:
+            # No loop to hand off to: notify inline
+            self._dispatch([update])
+    
+    async def _dispatch_updates(self):
+        """Drain queued updates and notify callbacks once per batch.
+        
+        During bursts every wake-up picks up everything that arrived meanwhile
+        (up to ``_MAX_BATCH``), so batch callbacks see one call per burst
+        instead of one per tick. Per-tick callbacks still get each update.
+        """
+        while True:
+            try:
+                batch = [await self._queue.get()]
+                while len(batch) < _MAX_BATCH:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                
+                self._dispatch(batch)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error dispatching Polygon updates: {e}")
+    
+    def _dispatch(self, batch: List[Dict[str, Any]]):
+        for callback in self._batch_callbacks_snapshot:
+            try:
+                callback(batch)
+            except Exception as e:
+                logger.error(f"Error in batch callback {callback.__name__}: {e}")
+        
+        for callback in self._callbacks_snapshot:
+            for update in batch:
+                try:
+                    callback(update)
+                except Exception as e:
+                    logger.error(f"Error in callback {callback.__name__}: {e}")
+    
     def get_latest_data(self, symbol: str) -> Dict[str, Any]:
         """Get latest data for a symbol (would need REST API call)."""
         # For now, return placeholder - implement REST API call if needed
@@ -117,6 +272,10 @@ class PolygonStreamer:
             'is_realtime': True
         }
     
+    def latest_prices_snapshot(self) -> Dict[str, float]:
+        """Copy of the last streamed price per symbol."""
+        return dict(self.last_prices)
+    
     def is_connected(self) -> bool:
         """Check if WebSocket is connected."""
         return self.is_streaming and self.client is not None
@@ -2,43 +2,68 @@
 WebSocket client for real-time market data streaming.
 This is a basic implementation that can be extended with actual WebSocket connections.
 """
-from typing import List, Dict, Any, Callable, Optional
+from typing import List, Dict, Any, Callable, Optional, Tuple
 import logging
+import threading
 import asyncio
 import time
 import random
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Mock base prices - replace with real data source
+_BASE_PRICES: Dict[str, float] = {
+    'AAPL': 150.0,
+    'MSFT': 300.0,
+    'NVDA': 400.0,
+    'GOOGL': 2500.0,
+    'TSLA': 200.0
+}
+
 class MarketDataStream:
     """WebSocket client for streaming market data."""
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.callbacks: List[Callable] = []
+        # Immutable copy iterated on every tick; rebuilt only when callbacks change
+        self._callbacks_snapshot: Tuple[Callable, ...] = ()
+        self._callbacks_lock = threading.Lock()
         self.is_streaming = False
         self.stream_task: Optional[asyncio.Task] = None
         self.symbols: List[str] = []
+        self._rng = np.random.default_rng()
+        self.last_prices: Dict[str, float] = {}
     
     def register_callback(self, callback: Callable[[Dict[str, Any]], None]):
         """Register a callback for market data updates."""
-        self.callbacks.append(callback)
+        with self._callbacks_lock:
+            self.callbacks.append(callback)
+            self._callbacks_snapshot = tuple(self.callbacks)
         logger.info(f"Registered callback: {callback.__name__}")
     
     def unregister_callback(self, callback: Callable[[Dict[str, Any]], None]):
         """Unregister a callback."""
-        if callback in self.callbacks:
+        with self._callbacks_lock:
+            if callback not in self.callbacks:
+                return
             self.callbacks.remove(callback)
+            self._callbacks_snapshot = tuple(self.callbacks)
             logger.info(f"Unregistered callback: {callback.__name__}")
     
     def start_stream(self, symbols: List[str]) -> bool:
         """Start streaming market data for specified symbols."""
         try:
             if self.is_streaming:
-                logger.warning("Stream already running")
+                # The running loop re-reads self.symbols each pass, so just extend it
+                new_symbols = [s for s in symbols if s not in self.symbols]
+                self.symbols.extend(new_symbols)
+                if new_symbols:
+                    logger.info(f"Added symbols to running stream: {new_symbols}")
                 return True
             
-            self.symbols = symbols
+            self.symbols = list(symbols)
             self.is_streaming = True
             
             # Start the streaming task
@@ -68,23 +93,27 @@ class MarketDataStream:
         
         while self.is_streaming:
             try:
-                # Simulate market data updates
-                for symbol in self.symbols:
-                    # Generate mock price data
-                    price_change = random.uniform(-0.02, 0.02)  # -2% to +2%
-                    base_price = self._get_base_price(symbol)
-                    new_price = base_price * (1 + price_change)
-                    
+                # Simulate market data updates for all symbols at once
+                symbols = list(self.symbols)
+                n = len(symbols)
+                base_prices = np.fromiter((self._get_base_price(s) for s in symbols), dtype=np.float64, count=n)
+                price_changes = self._rng.uniform(-0.02, 0.02, size=n)  # -2% to +2%
+                prices = np.round(base_prices * (1 + price_changes), 2).tolist()
+                volumes = self._rng.integers(1000, 10000, size=n, endpoint=True).tolist()
+                change_percents = np.round(price_changes * 100, 2).tolist()
+                
+                for symbol, price, volume, change_percent in zip(symbols, prices, volumes, change_percents):
                     update = {
                         'symbol': symbol,
-                        'price': round(new_price, 2),
+                        'price': price,
                         'timestamp': time.time(),
-                        'volume': random.randint(1000, 10000),
-                        'change_percent': round(price_change * 100, 2)
+                        'volume': volume,
+                        'change_percent': change_percent
                     }
+                    self.last_prices[symbol] = update['price']
                     
                     # Notify all callbacks
-                    for callback in self.callbacks:
+                    for callback in self._callbacks_snapshot:
                         try:
                             callback(update)
                         except Exception as e:
@@ -100,17 +129,10 @@ class MarketDataStream:
                 logger.error(f"Error in streaming loop: {e}")
                 await asyncio.sleep(5)  # Wait before retry
     
-    def _get_base_price(self, symbol: str) -> float:
+    @staticmethod
+    def _get_base_price(symbol: str) -> float:
         """Get base price for a symbol (mock implementation)."""
-        # Mock base prices - replace with real data source
-        base_prices = {
-            'AAPL': 150.0,
-            'MSFT': 300.0,
-            'NVDA': 400.0,
-            'GOOGL': 2500.0,
-            'TSLA': 200.0
-        }
-        return base_prices.get(symbol, 100.0)
+        return _BASE_PRICES.get(symbol, 100.0)
     
     def get_latest_data(self, symbol: str) -> Dict[str, Any]:
         """Get the latest data for a symbol."""
@@ -122,6 +144,10 @@ class MarketDataStream:
             'volume': random.randint(1000, 10000)
         }
     
+    def latest_prices_snapshot(self) -> Dict[str, float]:
+        """Copy of the last streamed price per symbol."""
+        return dict(self.last_prices)
+    
     def is_connected(self) -> bool:
         """Check if the stream is connected."""
         return self.is_streaming
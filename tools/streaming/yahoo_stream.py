@@ -4,45 +4,71 @@ Note: Yahoo Finance data is delayed and not true real-time.
 """
 import asyncio
 import logging
-from typing import List, Dict, Any, Callable, Optional
+import threading
+from typing import List, Dict, Any, Callable, Optional, Tuple
 import time
 import yfinance as yf
 import pandas as pd
-from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+
+def _latest_bar(data: pd.DataFrame) -> Tuple[float, int]:
+    """Close and volume of the last bar, read from the column arrays."""
+    close = float(data['Close'].to_numpy()[-1])
+    volume = int(data['Volume'].to_numpy()[-1]) if 'Volume' in data else 0
+    return close, volume
+
+
 class YahooFinanceStreamer:
     """Yahoo Finance data streamer using polling."""
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.callbacks: List[Callable] = []
+        # Immutable copy iterated on every tick; rebuilt only when callbacks change
+        self._callbacks_snapshot: Tuple[Callable, ...] = ()
+        self._callbacks_lock = threading.Lock()
         self.is_streaming = False
         self.stream_task: Optional[asyncio.Task] = None
         self.symbols: List[str] = []
         self.last_prices: Dict[str, float] = {}
+        # Tickers hold their own HTTP session; reusing them keeps connections warm
+        self._tickers: Dict[str, yf.Ticker] = {}
         self.poll_interval = config.get('yahoo_poll_interval', 60)  # Default 60 seconds
+        # Opt in to skip polls that return the same print (common outside market hours)
+        self.dedup = config.get('dedup_ticks', False)
     
     def register_callback(self, callback: Callable[[Dict[str, Any]], None]):
         """Register a callback for market data updates."""
-        self.callbacks.append(callback)
+        with self._callbacks_lock:
+            self.callbacks.append(callback)
+            self._callbacks_snapshot = tuple(self.callbacks)
         logger.info(f"Registered Yahoo Finance callback: {callback.__name__}")
     
     def unregister_callback(self, callback: Callable[[Dict[str, Any]], None]):
         """Unregister a callback."""
-        if callback in self.callbacks:
+        with self._callbacks_lock:
+            if callback not in self.callbacks:
+                return
             self.callbacks.remove(callback)
+            self._callbacks_snapshot = tuple(self.callbacks)
             logger.info(f"Unregistered callback: {callback.__name__}")
     
     def start_stream(self, symbols: List[str]) -> bool:
         """Start polling Yahoo Finance data for specified symbols."""
         try:
             if self.is_streaming:
-                logger.warning("Yahoo Finance stream already running")
+                # The running loop re-reads self.symbols each pass, so just extend it
+                new_symbols = [s for s in symbols if s not in self.symbols]
+                self.symbols.extend(new_symbols)
+                if new_symbols:
+                    logger.info(f"Added symbols to running stream: {new_symbols}")
                 return True
             
-            self.symbols = symbols
+            self.symbols = list(symbols)
+            for symbol in self.symbols:
+                self._ticker(symbol)
             self.is_streaming = True
             
             # Start the polling task
@@ -72,42 +98,21 @@ class YahooFinanceStreamer:
         
         while self.is_streaming:
             try:
-                # Fetch data for all symbols
-                for symbol in self.symbols:
+                # Snapshot: start_stream may add symbols while a poll is running
+                symbols = list(self.symbols)
+                # Network calls run in worker threads so other streams keep flowing
+                frames = await asyncio.to_thread(self._download_batch, symbols) if len(symbols) > 1 else {}
+                
+                # Single symbol or missing from the batch: concurrent per-symbol requests
+                missing = [symbol for symbol in symbols if symbol not in frames]
+                if missing:
+                    frames.update(zip(missing, await asyncio.gather(*(self._fetch_history(s) for s in missing))))
+                
+                for symbol in symbols:
+                    data = frames[symbol]
                     try:
-                        # Get latest data from Yahoo Finance
-                        ticker = yf.Ticker(symbol)
-                        data = ticker.history(period="1d", interval="1m")
-                        
-                        if not data.empty:
-                            latest = data.iloc[-1]
-                            current_price = latest['Close']
-                            
-                            # Calculate change
-                            prev_price = self.last_prices.get(symbol, current_price)
-                            change_percent = ((current_price - prev_price) / prev_price) * 100 if prev_price != 0 else 0
-                            
-                            update = {
-                                'symbol': symbol,
-                                'price': round(float(current_price), 2),
-                                'timestamp': time.time(),
-                                'volume': int(latest.get('Volume', 0)),
-                                'change_percent': round(change_percent, 2),
-                                'source': 'yahoo_finance',
-                                'is_realtime': False,  # Yahoo data is delayed
-                                'last_updated': datetime.now().isoformat()
-                            }
-                            
-                            # Update last price
-                            self.last_prices[symbol] = current_price
-                            
-                            # Notify all callbacks
-                            for callback in self.callbacks:
-                                try:
-                                    callback(update)
-                                except Exception as e:
-                                    logger.error(f"Error in callback {callback.__name__}: {e}")
-                        
+                        if data is not None and not data.empty:
+                            self._publish_update(symbol, *_latest_bar(data))
                     except Exception as e:
                         logger.error(f"Error fetching data for {symbol}: {e}")
                 
@@ -121,19 +126,78 @@ class YahooFinanceStreamer:
                 logger.error(f"Error in Yahoo Finance polling loop: {e}")
                 await asyncio.sleep(30)  # Wait before retry
     
+    def _download_batch(self, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+        """Today's 1m bars for every symbol from one threaded ``yf.download`` call."""
+        try:
+            data = yf.download(symbols, period="1d", interval="1m", group_by='ticker',
+                               threads=True, progress=False, auto_adjust=True)
+        except Exception as e:
+            logger.error(f"Batched Yahoo Finance download failed: {e}")
+            return {}
+        if data.empty or data.columns.nlevels < 2:
+            return {}
+        present = set(data.columns.get_level_values(0))
+        # Rows are aligned across tickers, so drop the ones this symbol has no bar for
+        return {symbol: data[symbol].dropna(how='all') for symbol in symbols if symbol in present}
+    
+    async def _fetch_history(self, symbol: str) -> Optional[pd.DataFrame]:
+        """Today's 1m bars for one symbol, fetched off the event loop."""
+        try:
+            return await asyncio.to_thread(self._ticker(symbol).history, period="1d", interval="1m")
+        except Exception as e:
+            logger.error(f"Error fetching data for {symbol}: {e}")
+            return None
+    
+    def _publish_update(self, symbol: str, current_price: float, volume: int):
+        """Build the update for the latest bar and notify all callbacks."""
+        prev_price = self.last_prices.get(symbol)
+        if self.dedup and prev_price == current_price:
+            return
+        
+        # Calculate change
+        if prev_price is None:
+            prev_price = current_price
+        change_percent = ((current_price - prev_price) / prev_price) * 100 if prev_price != 0 else 0
+        
+        update = {
+            'symbol': symbol,
+            'price': round(current_price, 2),
+            'timestamp': time.time(),
+            'volume': volume,
+            'change_percent': round(change_percent, 2),
+            'source': 'yahoo_finance',
+            'is_realtime': False  # Yahoo data is delayed
+        }
+        
+        # Update last price
+        self.last_prices[symbol] = current_price
+        
+        # Notify all callbacks
+        for callback in self._callbacks_snapshot:
+            try:
+                callback(update)
+            except Exception as e:
+                logger.error(f"Error in callback {callback.__name__}: {e}")
+    
+    def _ticker(self, symbol: str) -> yf.Ticker:
+        ticker = self._tickers.get(symbol)
+        if ticker is None:
+            ticker = self._tickers[symbol] = yf.Ticker(symbol)
+        return ticker
+    
     def get_latest_data(self, symbol: str) -> Dict[str, Any]:
         """Get the latest cached data for a symbol."""
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = self._ticker(symbol)
             data = ticker.history(period="1d", interval="1m")
             
             if not data.empty:
-                latest = data.iloc[-1]
+                price, volume = _latest_bar(data)
                 return {
                     'symbol': symbol,
-                    'price': round(float(latest['Close']), 2),
+                    'price': round(price, 2),
                     'timestamp': time.time(),
-                    'volume': int(latest.get('Volume', 0)),
+                    'volume': volume,
                     'source': 'yahoo_finance',
                     'is_realtime': False
                 }
@@ -148,6 +212,10 @@ class YahooFinanceStreamer:
             'is_realtime': False
         }
     
+    def latest_prices_snapshot(self) -> Dict[str, float]:
+        """Copy of the last polled price per symbol."""
+        return dict(self.last_prices)
+    
     def is_connected(self) -> bool:
         """Check if polling is active."""
         return self.is_streaming
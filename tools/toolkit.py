@@ -7,12 +7,39 @@ from langchain_community.tools.tavily_search import TavilySearchResults
 from stockstats import wrap as stockstats_wrap
 import os
 import logging
-from tools.economic_calendar_toolkit import EconomicCalendarToolkit
-from core.cache.redis_cache import cached_yfinance_data
+import threading
+from functools import cached_property
+import time
+from collections import OrderedDict
+from core.cache.redis_cache import cached_technical_indicators, cached_yfinance_data
 
 logger = logging.getLogger(__name__)
 tavily_tool = TavilySearchResults(max_results=3)
 
+# Query -> (expiry, results). Analysts re-issue identical (ticker, date) searches
+# across runs; an hour is short enough for news-style queries.
+_TAVILY_TTL = 3600
+_TAVILY_MAXSIZE = 1024
+_tavily_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_tavily_lock = threading.Lock()
+
+def _cached_tavily(query: str):
+    now = time.monotonic()
+    with _tavily_lock:
+        hit = _tavily_cache.get(query)
+        if hit is not None and hit[0] > now:
+            _tavily_cache.move_to_end(query)
+            return hit[1]
+    result = tavily_tool.invoke({"query": query})
+    # The tool reports failures as a string; only real result lists are cached
+    if isinstance(result, list):
+        with _tavily_lock:
+            _tavily_cache[query] = (now + _TAVILY_TTL, result)
+            _tavily_cache.move_to_end(query)
+            if len(_tavily_cache) > _TAVILY_MAXSIZE:
+                _tavily_cache.popitem(last=False)
+    return result
+
 @cached_yfinance_data
 @tool
 def get_yfinance_data(symbol: str, start_date: str, end_date: str) -> str:
@@ -27,16 +54,24 @@ def get_yfinance_data(symbol: str, start_date: str, end_date: str) -> str:
         logger.error(f"Error fetching Yahoo Finance data: {e}")
         return f"Error fetching Yahoo Finance data: {e}"
 
+@cached_technical_indicators
+def _compute_technical_indicators(symbol: str, start_date: str, end_date: str) -> str:
+    df = yf.download(symbol, start=start_date, end=end_date, progress=False)
+    if df.empty:
+        # yf.download reports failures as an empty frame; raise so nothing is cached
+        raise LookupError("No data to calculate indicators.")
+    stock_df = stockstats_wrap(df)
+    indicators = stock_df[['macd', 'rsi_14', 'boll', 'boll_ub', 'boll_lb', 'close_50_sma', 'close_200_sma']]
+    return indicators.tail().to_csv()
+
 @tool
 def get_technical_indicators(symbol: str, start_date: str, end_date: str) -> str:
     """Retrieve key technical indicators for a stock using stockstats library."""
     try:
-        df = yf.download(symbol, start=start_date, end=end_date, progress=False)
-        if df.empty:
-            return "No data to calculate indicators."
-        stock_df = stockstats_wrap(df)
-        indicators = stock_df[['macd', 'rsi_14', 'boll', 'boll_ub', 'boll_lb', 'close_50_sma', 'close_200_sma']]
-        return indicators.tail().to_csv()
+        # Empty downloads and errors raise out of the cached helper, so they are never cached
+        return _compute_technical_indicators(symbol, start_date, end_date)
+    except LookupError as e:
+        return str(e)
     except Exception as e:
         logger.error(f"Error calculating stockstats indicators: {e}")
         return f"Error calculating stockstats indicators: {e}"
@@ -60,7 +95,7 @@ def get_social_media_sentiment(ticker: str, trade_date: str) -> str:
     """Performs a live web search for social media sentiment regarding a stock."""
     try:
         query = f"social media sentiment and discussions for {ticker} stock around {trade_date}"
-        return tavily_tool.invoke({"query": query})
+        return _cached_tavily(query)
     except Exception as e:
         logger.error(f"Error fetching social media sentiment: {e}")
         return f"Error fetching social media sentiment: {e}"
@@ -70,7 +105,7 @@ def get_fundamental_analysis(ticker: str, trade_date: str) -> str:
     """Performs a live web search for recent fundamental analysis of a stock."""
     try:
         query = f"fundamental analysis and key financial metrics for {ticker} stock published around {trade_date}"
-        return tavily_tool.invoke({"query": query})
+        return _cached_tavily(query)
     except Exception as e:
         logger.error(f"Error fetching fundamental analysis: {e}")
         return f"Error fetching fundamental analysis: {e}"
@@ -80,7 +115,7 @@ def get_macroeconomic_news(trade_date: str) -> str:
     """Performs a live web search for macroeconomic news relevant to the stock market."""
     try:
         query = f"macroeconomic news and market trends affecting the stock market on {trade_date}"
-        return tavily_tool.invoke({"query": query})
+        return _cached_tavily(query)
     except Exception as e:
         logger.error(f"Error fetching macroeconomic news: {e}")
         return f"Error fetching macroeconomic news: {e}"
@@ -94,7 +129,21 @@ class Toolkit:
         self.get_social_media_sentiment = get_social_media_sentiment
         self.get_fundamental_analysis = get_fundamental_analysis
         self.get_macroeconomic_news = get_macroeconomic_news
-        self.economic_toolkit = EconomicCalendarToolkit(config)
-        self.get_economic_events = self.economic_toolkit.get_economic_events
-        self.get_fed_speeches = self.economic_toolkit.get_fed_speeches
-        self.get_economic_indicators = self.economic_toolkit.get_economic_indicators
\ No newline at end of file
+    
+    # Sub-toolkits (and their HTTP clients) are only imported and built when first used
+    @cached_property
+    def economic_toolkit(self):
+        from tools.economic_calendar_toolkit import EconomicCalendarToolkit
+        return EconomicCalendarToolkit(self.config)
+    
+    @property
+    def get_economic_events(self):
+        return self.economic_toolkit.get_economic_events
+    
+    @property
+    def get_fed_speeches(self):
+        return self.economic_toolkit.get_fed_speeches
+    
+    @property
+    def get_economic_indicators(self):
+        return self.economic_toolkit.get_economic_indicators
\ No newline at end of file
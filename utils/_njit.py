@@ -0,0 +1,21 @@
+"""Optional Numba JIT decorator.
+
+``njit`` compiles with Numba when it is installed and otherwise hands back the
+plain Python function, so numeric kernels keep working (slower) without it.
+"""
+
+try:
+    from numba import njit as _numba_njit
+except ImportError:  # numba is an optional accelerator
+    _numba_njit = None
+
+NUMBA_AVAILABLE = _numba_njit is not None
+
+
+def njit(*args, **kwargs):
+    """Drop-in for ``numba.njit``; supports both ``@njit`` and ``@njit(...)``."""
+    if _numba_njit is not None:
+        return _numba_njit(*args, **kwargs)
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda func: func